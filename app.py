@@ -1,8 +1,23 @@
+import os
+import time
+import sqlite3
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from databases.supabase_client import supabase
+from databases.backend import get_client
+from dashboard.loader import load_tables, compact_frame, memory_report, format_memory_report
+from dashboard import snapshot
+from dashboard.queries import normalize_filters
+from dashboard.aggregates import build_aggregates, filter_in, rollup, rank_bands
+from dashboard.joins import JoinIndex, build_joins
+from dashboard.search import NameIndex, fold
+from dashboard.charts import scatter
+from dashboard.table import paged_table
+from dashboard.sql_engine import QueryEngine, load_queries, normalize_sql, MAX_ROWS
+from dashboard import memo
+
+rerun_start = time.perf_counter()
 
 # =================================================
 # PAGE CONFIG
@@ -104,37 +119,65 @@ input, textarea {
 # DATA LOADER
 # =================================================
 @st.cache_data(ttl=600)
-def load_table(table):
-    response = supabase.table(table).select("*").execute()
-    return pd.DataFrame(response.data)
+def load_all_tables(version):
+    # Prefer the on-disk snapshot published by insert_data.py; the
+    # version is part of the cache key, so a new snapshot is picked up
+    # on the next rerun
+    if version:
+        frames, timings = snapshot.read_snapshot(version)
+        frames = {table: compact_frame(table, frame) for table, frame in frames.items()}
+
+    # All six tables in parallel; each is paged, projected and typed
+    # (see dashboard/loader.py)
+    else:
+        frames, timings = load_tables(get_client())
+
+    return frames, timings, time.time()
 
 # =================================================
 # LOAD DATA
 # =================================================
-categories = load_table("categories")
-competitions = load_table("competitions")
-competitors = load_table("competitors")
-rankings = load_table("competitor_rankings")
-complexes = load_table("complexes")
-venues = load_table("venues")
+data_version = snapshot.current_version() if snapshot.available() else None
+tables, load_times, loaded_at = load_all_tables(data_version)
+
+# Identifies the loaded data in memo keys (a database load has no
+# snapshot version, so the load time stands in for it)
+data_key = data_version or f"db@{loaded_at}"
+
+categories = tables["categories"]
+competitions = tables["competitions"]
+competitors = tables["competitors"]
+rankings = tables["competitor_rankings"]
+complexes = tables["complexes"]
+venues = tables["venues"]
+
+
+@st.cache_data(ttl=600)
+def load_aggregates(version):
+    # Precomputed by insert_data.py when reading a snapshot,
+    # otherwise built once per data version
+    tables, _, _ = load_all_tables(version)
+    return build_aggregates(tables)
+
+
+aggregates = load_aggregates(data_version)
+agg_competitions = aggregates["agg_competitions"]
+agg_venues = aggregates["agg_venues"]
+agg_country_rankings = aggregates["agg_country_rankings"]
 
 # =================================================
 # PRE-JOINS
 # =================================================
-competition_category = competitions.merge(
-    categories, on="category_id", how="left"
-)
-
-ranking_df = competitors.merge(
-    rankings, on="competitor_id", how="left"
-)
-
-venue_complex = venues.merge(
-    complexes, on="complex_id", how="left"
+# Key indexes (and the competition hierarchy) are built once per data
+# version; joins are lookups against them (see dashboard/joins.py).
+# Derived frames are memoised per data version (and filter state
+# below), so reruns from unrelated widgets skip the joins and filters
+join_index = memo.memoize(("index", data_key), lambda: JoinIndex(tables))
+
+competition_category, ranking_df, venue_complex = memo.memoize(
+    ("joins", data_key), lambda: build_joins(tables, join_index)
 )
 
-ranking_df = ranking_df.dropna(subset=["rank"])
-
 # =================================================
 # SIDEBAR FILTERS
 # =================================================
@@ -162,52 +205,98 @@ country_filter = st.sidebar.multiselect(
     sorted(ranking_df["country"].dropna().unique())
 )
 
+with st.sidebar.expander("⏱ Data load times (last cold start)"):
+    st.caption(f"source: {data_version or 'database'}")
+    for table, seconds in load_times.items():
+        st.caption(f"{table}: {seconds * 1000:.0f} ms")
+    st.caption(f"memo: {memo.stats()}")
+
+with st.sidebar.expander("🧮 Frame memory (plain → compact dtypes)"):
+    for line in memo.memoize(("memory", data_key), lambda: format_memory_report(memory_report(tables))):
+        st.caption(line)
+
 
 # =================================================
 # APPLY FILTERS
 # =================================================
-filtered_competitions = competition_category.copy()
+filter_state = normalize_filters(
+    category_filter, gender_filter, rank_range, country_filter
+)
 
-if category_filter:
-    filtered_competitions = filtered_competitions[
-        filtered_competitions["category_name"].isin(category_filter)
-    ]
 
-if gender_filter:
-    filtered_competitions = filtered_competitions[
-        filtered_competitions["gender"].isin(gender_filter)
-    ]
+def apply_filters():
+    filtered_competitions = competition_category.copy()
+
+    if category_filter:
+        filtered_competitions = filtered_competitions[
+            filtered_competitions["category_name"].isin(category_filter)
+        ]
 
-filtered_rankings = ranking_df.copy()
+    if gender_filter:
+        filtered_competitions = filtered_competitions[
+            filtered_competitions["gender"].isin(gender_filter)
+        ]
 
-filtered_rankings = filtered_rankings[
-    (filtered_rankings["rank"] >= rank_range[0]) &
-    (filtered_rankings["rank"] <= rank_range[1])
-]
+    filtered_rankings = ranking_df.copy()
 
-if country_filter:
     filtered_rankings = filtered_rankings[
-        filtered_rankings["country"].isin(country_filter)
+        (filtered_rankings["rank"] >= rank_range[0]) &
+        (filtered_rankings["rank"] <= rank_range[1])
     ]
 
+    if country_filter:
+        filtered_rankings = filtered_rankings[
+            filtered_rankings["country"].isin(country_filter)
+        ]
+
+    return filtered_competitions, filtered_rankings
+
+
+filtered_competitions, filtered_rankings = memo.memoize(
+    ("filtered", data_key, filter_state), apply_filters
+)
+
+# Rows of agg_country_rankings matching the filters, so country and
+# movement charts roll up the summary instead of grouping every row.
+# None when a country filter is set or the rank range does not start
+# and end on band edges; those charts group filtered_rankings instead
+summary_bands = None if country_filter else rank_bands(rank_range, int(ranking_df["rank"].max()))
+ranking_summary = (
+    None if summary_bands is None
+    else agg_country_rankings[agg_country_rankings["rank_band"].isin(summary_bands)]
+)
 
 # =================================================
-# TABS
+# VIEWS
 # =================================================
-tab1, tab2, tab3, tab4, tab5,tab6 = st.tabs([
+VIEWS = [
     "Project Overview",
     "🏟 Competitions",
     "👥 Competitors",
     "📍 Venues",
     "📊 Dashboard",
     "📘 SQL Explorer",
-    
-])
+]
+
+SQL_QUERIES = load_queries()
+
+# Lazy mode (default) renders only the selected view; set
+# DASHBOARD_LAZY_TABS=0 to get st.tabs, which runs every view each rerun
+LAZY_TABS = os.getenv("DASHBOARD_LAZY_TABS", "1") != "0"
+
+
+def cached_figure(view, name, build, *extra):
+    # Chart data prep + figure, built once per view, chart, data
+    # version, filter state and any view-specific inputs
+    return memo.memoize(
+        ("figure", view, name, data_key, filter_state) + extra, build
+    )
+
 
 # =================================================
 # TAB: 📘PROJECT OVERVIEW
 # =================================================
-with tab1:
+def render_overview():
     st.header("📘 Game Analytics: Unlocking Tennis Data")
 
     st.subheader("🎯 Project Objective")
@@ -279,37 +368,65 @@ SQL analytics, and Streamlit application development**.
 # =================================================
 # TAB 2: COMPETITIONS
 # =================================================
-with tab2:
+def render_competitions():
     st.header("🏟 Competitions Explorer")
 
-    st.dataframe(
+    paged_table(
         filtered_competitions[
             ["competition_name", "category_name", "type", "gender"]
         ],
-        use_container_width=True
+        key="competitions",
+        cache_key=(data_key, filter_state)
     )
 
     st.subheader("📊 Competitions per Category")
-    dist = (
-        filtered_competitions
-        .groupby("category_name")
-        .size()
-        .reset_index(name="count")
-    )
 
-    fig = px.bar(
-        dist,
-        x="category_name",
-        y="count",
-        color="category_name",
-        color_discrete_sequence=px.colors.qualitative.Set2
-    )
+    def dist_chart():
+        dist = rollup(
+            filter_in(
+                filter_in(agg_competitions, "category_name", category_filter),
+                "gender", gender_filter
+            ),
+            "category_name"
+        ).rename(columns={"total": "count"})
+
+        return px.bar(
+            dist,
+            x="category_name",
+            y="count",
+            color="category_name",
+            color_discrete_sequence=px.colors.qualitative.Set2
+        )
+
+    fig = cached_figure("competitions", "dist", dist_chart)
     st.plotly_chart(fig, use_container_width=True)
 
+    # -------------------------------------------------
+    # HIERARCHY: read from the index's parent -> children adjacency
+    # -------------------------------------------------
+    st.subheader("🌳 Competition Hierarchy")
+
+    parents = join_index.parents()
+    if parents.empty:
+        st.info("No competition in the loaded data has sub-competitions.")
+        return
+
+    names = dict(zip(parents["competition_id"], parents["competition_name"]))
+    parent_id = st.selectbox(
+        "Parent competition",
+        sorted(names, key=lambda competition_id: names[competition_id]),
+        format_func=names.get
+    )
+    paged_table(
+        join_index.children(parent_id)[["competition_name", "type", "gender"]],
+        key="hierarchy",
+        cache_key=(data_key, parent_id)
+    )
+
 # =================================================
 # TAB 3: COMPETITORS & RANKINGS
 # =================================================
-with tab3:
+def render_competitors():
     st.header("👥 Competitors & Rankings")
 
     # -------------------------------------------------
@@ -323,12 +440,34 @@ with tab3:
     # -------------------------------------------------
     # APPLY SEARCH FILTER
     # -------------------------------------------------
-    search_df = filtered_rankings.copy()
-
-    if search_name:
-        search_df = search_df[
-            search_df["name"].str.contains(search_name, case=False, na=False)
-        ]
+    # Names are looked up in an index built once per data version
+    # (accent-insensitive, punctuation ignored); when nothing matches
+    # literally, close spellings are shown instead
+    def apply_search():
+        search_df = filtered_rankings
+
+        if search_key:
+            name_index = memo.memoize(("name_index", data_key), lambda: NameIndex(competitors))
+            for fuzzy in (False, True):
+                ids = name_index.search(search_key, fuzzy=fuzzy)
+                # Best match first, in the order the index ranked the ids
+                position = pd.Index(ids).get_indexer(search_df["competitor_id"])
+                found = position >= 0
+                matches = search_df[found].iloc[position[found].argsort(kind="stable")]
+                if not matches.empty:
+                    return matches, fuzzy
+            return matches, False
+        return search_df, False
+
+    search_key = fold(search_name)
+    search_df, fuzzy_match = memo.memoize(
+        ("search", data_key, filter_state, search_key), apply_search
+    )
+    if fuzzy_match:
+        st.caption(f"No exact match for “{search_name}”, showing close matches")
+    if search_df.empty:
+        st.info("No competitors match the search and filters.")
+        return
 
     # -------------------------------------------------
     # BASIC METRICS (USE SEARCH_DF)
@@ -352,39 +491,38 @@ with tab3:
     # RAW DATA PREVIEW (USE SEARCH_DF)
     # -------------------------------------------------
     st.subheader("📋 Competitor Data Preview")
-    
-    ordered_df=(
-        search_df.sort_values(
-            by=["rank", "points", "name"],
-            ascending=[True, False, True]
-        )
-        .reset_index(drop=True) 
+
+    paged_table(
+        search_df[["name", "country", "rank", "points", "movement"]],
+        key="competitors",
+        cache_key=(data_key, filter_state, search_key),
+        # Search results keep their best-match-first order
+        order=None if search_key else [("rank", True), ("points", False), ("name", True)]
     )
-    
-    st.dataframe(
-    ordered_df[["name", "country", "rank", "points", "movement"]],
-    use_container_width=True
-)
+
     # -------------------------------------------------
     # RANK VS POINTS (TOP PLAYERS) – USE SEARCH_DF
     # -------------------------------------------------
     st.subheader("🌟 Rank vs Points (Top Players)")
 
-    top_players = (
-        search_df
-        .sort_values("points", ascending=False)
-        .head(50)
-    )
+    def top_players_chart():
+        top_players = (
+            search_df
+            .sort_values("points", ascending=False)
+            .head(50)
+        )
 
-    fig = px.scatter(
-        top_players,
-        x="rank",
-        y="points",
-        size="points",
-        color="country",
-        hover_name="name",
-        color_discrete_sequence=px.colors.qualitative.Bold
-    )
+        return px.scatter(
+            top_players,
+            x="rank",
+            y="points",
+            size="points",
+            color="country",
+            hover_name="name",
+            color_discrete_sequence=px.colors.qualitative.Bold
+        )
+
+    fig = cached_figure("competitors", "top_players", top_players_chart, search_key)
     st.plotly_chart(fig, use_container_width=True)
 
     st.divider()
@@ -394,12 +532,16 @@ with tab3:
     # -------------------------------------------------
     st.subheader("📈 Rank vs Points Relationship")
 
-    fig = px.scatter(
-        search_df,
-        x="rank",
-        y="points",
-        color="country",
-        hover_name="name"
+    fig = cached_figure(
+        "competitors", "rank_points",
+        lambda: scatter(
+            search_df,
+            x="rank",
+            y="points",
+            color="country",
+            hover_name="name"
+        ),
+        search_key
     )
     st.plotly_chart(fig, use_container_width=True)
 
@@ -410,13 +552,15 @@ with tab3:
     # -------------------------------------------------
     st.subheader("🏆 Top 10 Ranked Competitors")
 
-    top10 = search_df.sort_values("rank").head(10)
-
-    fig = px.bar(
-        top10,
-        x="name",
-        y="points",
-        color="rank"
+    fig = cached_figure(
+        "competitors", "top10",
+        lambda: px.bar(
+            search_df.sort_values("rank").head(10),
+            x="name",
+            y="points",
+            color="rank"
+        ),
+        search_key
     )
     st.plotly_chart(fig, use_container_width=True)
 
@@ -427,20 +571,33 @@ with tab3:
     # -------------------------------------------------
     st.subheader("🔄 Rank Movement Analysis")
 
-    movement_df = (
-        search_df["movement"]
-        .apply(lambda x: "Improved" if x > 0 else "Declined" if x < 0 else "Stable")
-        .value_counts()
-        .reset_index()
-    )
-    movement_df.columns = ["movement_type", "count"]
+    def movement_chart():
+        if not search_key and ranking_summary is not None:
+            movement_df = pd.DataFrame({
+                "movement_type": ["Improved", "Declined", "Stable"],
+                "count": [int(ranking_summary[c].sum()) for c in ("improved", "declined", "stable")],
+            })
+            movement_df = movement_df[movement_df["count"] > 0].sort_values(
+                "count", ascending=False, kind="stable"
+            )
+        else:
+            movement_df = (
+                search_df["movement"]
+                .fillna(0)
+                .apply(lambda x: "Improved" if x > 0 else "Declined" if x < 0 else "Stable")
+                .value_counts()
+                .reset_index()
+            )
+            movement_df.columns = ["movement_type", "count"]
+
+        return px.pie(
+            movement_df,
+            names="movement_type",
+            values="count",
+            hole=0.4
+        )
 
-    fig = px.pie(
-        movement_df,
-        names="movement_type",
-        values="count",
-        hole=0.4
-    )
+    fig = cached_figure("competitors", "movement", movement_chart, search_key)
     st.plotly_chart(fig, use_container_width=True)
 
     st.divider()
@@ -450,21 +607,28 @@ with tab3:
     # -------------------------------------------------
     st.subheader("🌍 Competitors by Country")
 
-    country_df = (
-        search_df
-        .groupby("country")
-        .size()
-        .reset_index(name="total_competitors")
-        .sort_values("total_competitors", ascending=False)
-        .head(10)
-    )
+    def country_chart():
+        if not search_key and ranking_summary is not None:
+            country_df = rollup(ranking_summary, "country").rename(
+                columns={"total": "total_competitors"}
+            )
+        else:
+            country_df = (
+                search_df
+                .groupby("country")
+                .size()
+                .reset_index(name="total_competitors")
+            )
+        country_df = country_df.sort_values("total_competitors", ascending=False).head(10)
+
+        return px.bar(
+            country_df,
+            x="country",
+            y="total_competitors",
+            color="total_competitors"
+        )
 
-    fig = px.bar(
-        country_df,
-        x="country",
-        y="total_competitors",
-        color="total_competitors"
-    )
+    fig = cached_figure("competitors", "country", country_chart, search_key)
     st.plotly_chart(fig, use_container_width=True)
 
     
@@ -472,7 +636,7 @@ with tab3:
 # =================================================
 # TAB 4: COMPLEXES & VENUES
 # =================================================
-with tab4:
+def render_venues():
     st.header("📍 Venues Explorer")
 
     # -------------------------------------------------
@@ -486,6 +650,9 @@ with tab4:
     country_venues = venue_complex[
         venue_complex["country_name"] == venue_country
     ]
+    country_venue_counts = agg_venues[
+        agg_venues["country_name"] == venue_country
+    ]
 
     st.divider()
 
@@ -510,11 +677,12 @@ with tab4:
     # -------------------------------------------------
     st.subheader("📋 Venue Details")
 
-    st.dataframe(
+    paged_table(
         country_venues[
             ["venue_name", "complex_name", "city_name", "timezone"]
         ],
-        use_container_width=True
+        key="venues",
+        cache_key=(data_key, venue_country)
     )
 
     st.divider()
@@ -524,20 +692,20 @@ with tab4:
     # -------------------------------------------------
     st.subheader("🏟 Venues per Complex")
 
-    vc = (
-        country_venues
-        .groupby("complex_name")
-        .size()
-        .reset_index(name="count")
-    )
+    def complex_chart():
+        vc = rollup(
+            country_venue_counts, "complex_name", "venues"
+        ).rename(columns={"venues": "count"})
+
+        return px.bar(
+            vc,
+            x="complex_name",
+            y="count",
+            color="complex_name",
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
 
-    fig = px.bar(
-        vc,
-        x="complex_name",
-        y="count",
-        color="complex_name",
-        color_discrete_sequence=px.colors.qualitative.Pastel
-    )
+    fig = cached_figure("venues", "complex", complex_chart, venue_country)
     st.plotly_chart(fig, use_container_width=True)
 
     st.divider()
@@ -547,19 +715,16 @@ with tab4:
     # -------------------------------------------------
     st.subheader("🏙 Venues by City")
 
-    city_df = (
-        country_venues
-        .groupby("city_name")
-        .size()
-        .reset_index(name="venues")
-        .sort_values("venues", ascending=False)
-    )
-
-    fig = px.bar(
-        city_df,
-        x="city_name",
-        y="venues",
-        color="venues"
+    fig = cached_figure(
+        "venues", "city",
+        lambda: px.bar(
+            rollup(country_venue_counts, "city_name", "venues")
+            .sort_values("venues", ascending=False),
+            x="city_name",
+            y="venues",
+            color="venues"
+        ),
+        venue_country
     )
     st.plotly_chart(fig, use_container_width=True)
 
@@ -570,18 +735,15 @@ with tab4:
     # -------------------------------------------------
     st.subheader("🕒 Venues by Timezone")
 
-    tz_df = (
-        country_venues
-        .groupby("timezone")
-        .size()
-        .reset_index(name="venues")
-    )
-
-    fig = px.pie(
-        tz_df,
-        names="timezone",
-        values="venues",
-        hole=0.4
+    fig = cached_figure(
+        "venues", "timezone",
+        lambda: px.pie(
+            rollup(country_venue_counts, "timezone", "venues"),
+            names="timezone",
+            values="venues",
+            hole=0.4
+        ),
+        venue_country
     )
     st.plotly_chart(fig, use_container_width=True)
 
@@ -591,7 +753,7 @@ with tab4:
 # TAB 5: DASHBOARD
 # =================================================
 
-with tab5:
+def render_dashboard():
     st.header("📊 Performance Dashboard")
 
     # -----------------------------
@@ -673,47 +835,68 @@ with tab5:
     # LINE CHART
     # -----------------------------
     st.subheader("📈 Rank vs Points Trend")
-    trend_df = filtered_rankings.sort_values("rank").head(50)
-
-    fig_line = px.line(
-        trend_df,
-        x="rank",
-        y="points",
-        markers=True,
-        color_discrete_sequence=["#7CFCB5"]
-    )
-    fig_line.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font_color="white"
-    )
+    def trend_chart():
+        trend_df = filtered_rankings.sort_values("rank").head(50)
+
+        fig_line = px.line(
+            trend_df,
+            x="rank",
+            y="points",
+            markers=True,
+            color_discrete_sequence=["#7CFCB5"]
+        )
+        fig_line.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font_color="white"
+        )
+        return fig_line
+
+    fig_line = cached_figure("dashboard", "trend", trend_chart)
     st.plotly_chart(fig_line, use_container_width=True)
 
+    # Country charts roll up ranking_summary when the filters allow it
+    def country_totals():
+        if ranking_summary is not None:
+            return rollup(ranking_summary, "country", ["total", "total_points", "points_counted"])
+        return (
+            filtered_rankings
+            .groupby("country", observed=True)
+            .agg(
+                total=("competitor_id", "size"),
+                total_points=("points", "sum"),
+                points_counted=("points", "count"),
+            )
+            .reset_index()
+        )
+
     # -----------------------------
     # COUNTRY DISTRIBUTION
     # -----------------------------
     st.subheader("🌍 Country Distribution")
-    country_count = (
-        filtered_rankings
-        .groupby("country")
-        .size()
-        .reset_index(name="count")
-        .sort_values("count", ascending=False)
-        .head(10)
-    )
+    def country_chart():
+        country_count = (
+            country_totals()
+            .rename(columns={"total": "count"})[["country", "count"]]
+            .sort_values("count", ascending=False)
+            .head(10)
+        )
 
-    fig_bar = px.bar(
-        country_count,
-        x="country",
-        y="count",
-        color="count",
-        color_continuous_scale="Viridis"
-    )
-    fig_bar.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font_color="white"
-    )
+        fig_bar = px.bar(
+            country_count,
+            x="country",
+            y="count",
+            color="count",
+            color_continuous_scale="Viridis"
+        )
+        fig_bar.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font_color="white"
+        )
+        return fig_bar
+
+    fig_bar = cached_figure("dashboard", "country", country_chart)
     st.plotly_chart(fig_bar, use_container_width=True)
 
     st.markdown("---")
@@ -722,18 +905,22 @@ with tab5:
     # DONUT: TOP 10 POINT SHARE
     # -----------------------------
     st.subheader("🥇 Top 10 Players – Points Share")
-    top10 = filtered_rankings.sort_values("points", ascending=False).head(10)
+    def donut_chart():
+        top10 = filtered_rankings.sort_values("points", ascending=False).head(10)
+
+        fig_donut = px.pie(
+            top10,
+            names="name",
+            values="points",
+            hole=0.5
+        )
+        fig_donut.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            font_color="white"
+        )
+        return fig_donut
 
-    fig_donut = px.pie(
-        top10,
-        names="name",
-        values="points",
-        hole=0.5
-    )
-    fig_donut.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        font_color="white"
-    )
+    fig_donut = cached_figure("dashboard", "donut", donut_chart)
     st.plotly_chart(fig_donut, use_container_width=True)
 
     st.markdown("---")
@@ -746,27 +933,30 @@ with tab5:
     # BAR: AVG POINTS BY COUNTRY
     # -----------------------------
     st.subheader("🌍 Average Points by Country")
-    avg_country = (
-        filtered_rankings
-        .groupby("country")["points"]
-        .mean()
-        .reset_index(name="avg_points")
-        .sort_values("avg_points", ascending=False)
-        .head(10)
-    )
+    def avg_points_chart():
+        totals = country_totals()
+        avg_country = (
+            totals
+            .assign(avg_points=totals["total_points"] / totals["points_counted"])[["country", "avg_points"]]
+            .sort_values("avg_points", ascending=False)
+            .head(10)
+        )
 
-    fig_avg = px.bar(
-        avg_country,
-        x="country",
-        y="avg_points",
-        color="avg_points",
-        color_continuous_scale="Turbo"
-    )
-    fig_avg.update_layout(
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font_color="white"
-    )
+        fig_avg = px.bar(
+            avg_country,
+            x="country",
+            y="avg_points",
+            color="avg_points",
+            color_continuous_scale="Turbo"
+        )
+        fig_avg.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font_color="white"
+        )
+        return fig_avg
+
+    fig_avg = cached_figure("dashboard", "avg_points", avg_points_chart)
     st.plotly_chart(fig_avg, use_container_width=True)
 
     
@@ -774,165 +964,88 @@ with tab5:
 # =================================================
 # TAB 6: SQL EXPLORER (DROPDOWN + VISUALS)
 # =================================================
-with tab6:
+def render_sql_explorer():
     st.header("📘 SQL Explorer")
     st.caption("Select a query → View SQL → View Visualization")
 
-    QUERY_LIST = [
-        "1. Competitions with Category",
-        "2. Competitions per Category",
-        "3. Doubles Competitions",
-        "4. ITF Men Competitions",
-        "5. Parent & Sub Competitions",
-        "6. Competition Type Distribution",
-        "7. Top-level Competitions",
-        "8. Rank vs Points",
-        "9. Top 5 Ranked Players",
-        "10. Stable Rank Players",
-        "11. Competitors per Country",
-        "12. Highest Points Holders",
-        "13. Venues with Complex",
-        "14. Venues per Complex",
-        "15. Venues in AUSTRALIA",
-        "16. Venue Timezones",
-        "17. Complexes with >1 Venue",
-        "18. Venues by Country",
-        "19. Venues for Nacional"
-    ]
+    # The queries in sql/*.sql run for real against an in-memory SQLite
+    # copy of the loaded tables (see dashboard/sql_engine.py), built
+    # once per data version; results are cached per normalised SQL
+    engine = memo.memoize(("sql_engine", data_key), lambda: QueryEngine(tables))
+
+    QUERY_LIST = [f"{group} · {title}" for group, title, _ in SQL_QUERIES]
+    CUSTOM = "✏️ Custom query"
 
-    choice = st.selectbox("Select SQL Query", QUERY_LIST)
+    choice = st.selectbox("Select SQL Query", QUERY_LIST + [CUSTOM])
 
     st.divider()
 
-    # ================= COMPETITIONS =================
-    if choice == QUERY_LIST[0]:
-        st.subheader("Competitions with Category")
-        st.code("""
-SELECT c.competition_name, cat.category_name
-FROM Competitions c
-JOIN Categories cat ON c.category_id = cat.category_id;
-""", language="sql")
-        st.dataframe(competition_category[["competition_name","category_name"]])
-
-    elif choice == QUERY_LIST[1]:
-        st.subheader("Competitions per Category")
-        st.code("""
-SELECT cat.category_name, COUNT(*) FROM Competitions GROUP BY cat.category_name;
-""", language="sql")
-        df = competition_category.groupby("category_name").size().reset_index(name="total")
-        st.plotly_chart(px.bar(df, x="category_name", y="total"), use_container_width=True)
-
-    elif choice == QUERY_LIST[2]:
-        st.subheader("Doubles Competitions")
-        st.code("SELECT * FROM Competitions WHERE type='doubles';", language="sql")
-        st.dataframe(competitions[competitions["type"]=="doubles"])
-
-    elif choice == QUERY_LIST[3]:
-        st.subheader("ITF Men Competitions")
-        st.code("SELECT * FROM Competitions WHERE category='ITF Men';", language="sql")
-        st.dataframe(
-            competition_category[
-                competition_category["category_name"]=="ITF Men"
-            ][["competition_name"]]
+    if choice == CUSTOM:
+        sql = st.text_area(
+            "Read-only SQL (SQLite dialect)",
+            "SELECT country, COUNT(*) AS total\nFROM Competitors\nGROUP BY country\nORDER BY total DESC;",
+            height=150
         )
+    else:
+        group, title, sql = SQL_QUERIES[QUERY_LIST.index(choice)]
+        st.subheader(title)
+        st.code(sql, language="sql")
 
-    elif choice == QUERY_LIST[4]:
-        st.subheader("Parent & Sub Competitions")
-        st.code("SELECT parent, child FROM Competitions;", language="sql")
-        pc = competitions.merge(
-            competitions,
-            left_on="parent_id",
-            right_on="competition_id",
-            suffixes=("_child","_parent")
+    if not normalize_sql(sql):
+        return
+
+    try:
+        result = memo.memoize(
+            ("sql", data_key, normalize_sql(sql)), lambda: engine.execute(sql)
+        )
+    except (TimeoutError, sqlite3.Error) as e:
+        st.error(f"❌ {e}")
+        return
+
+    st.caption(
+        f"{len(result.frame)} rows in {result.seconds * 1000:.0f} ms"
+        + (f" (first {MAX_ROWS} shown)" if result.truncated else "")
+    )
+    paged_table(result.frame, key="sql", cache_key=(data_key, normalize_sql(sql)))
+
+    # Label + measure -> bar chart; two measures -> scatter
+    frame = result.frame
+    numeric = [c for c in frame.columns if pd.api.types.is_numeric_dtype(frame[c])]
+    labels = [c for c in frame.columns if c not in numeric]
+
+    if len(numeric) >= 2:
+        fig = cached_figure(
+            "sql", normalize_sql(sql),
+            lambda: scatter(frame, x=numeric[0], y=numeric[1],
+                            hover_name=labels[0] if labels else None)
         )
-        st.dataframe(pc[["competition_name_parent","competition_name_child"]])
-
-    elif choice == QUERY_LIST[5]:
-        st.subheader("Competition Type Distribution")
-        st.code("SELECT category, type, COUNT(*) FROM Competitions;", language="sql")
-        df = competition_category.groupby(["category_name","type"]).size().reset_index(name="total")
-        st.plotly_chart(px.bar(df, x="category_name", y="total", color="type", barmode="stack"),
-                         use_container_width=True)
-
-    elif choice == QUERY_LIST[6]:
-        st.subheader("Top-level Competitions")
-        st.code("SELECT * FROM Competitions WHERE parent_id IS NULL;", language="sql")
-        st.dataframe(competitions[competitions["parent_id"].isna()][["competition_name"]])
-
-    # ================= COMPETITORS =================
-    elif choice == QUERY_LIST[7]:
-        st.subheader("Rank vs Points")
-        st.code("SELECT rank, points FROM Competitor_Rankings;", language="sql")
-        st.plotly_chart(px.scatter(ranking_df, x="rank", y="points",
-                                   hover_name="name", color="country"),
-                         use_container_width=True)
-
-    elif choice == QUERY_LIST[8]:
-        st.subheader("Top 5 Ranked Players")
-        st.code("SELECT * FROM Rankings WHERE rank<=5;", language="sql")
-        top5 = ranking_df[ranking_df["rank"]<=5]
-        st.plotly_chart(px.bar(top5, x="name", y="points", color="rank"),
-                         use_container_width=True)
-
-    elif choice == QUERY_LIST[9]:
-        st.subheader("Stable Rank Players")
-        st.code("SELECT * FROM Rankings WHERE movement=0;", language="sql")
-        st.dataframe(ranking_df[ranking_df["movement"]==0][["name","rank","movement"]])
-
-    elif choice == QUERY_LIST[10]:
-        st.subheader("Competitors per Country")
-        st.code("SELECT country, COUNT(*) FROM Competitors GROUP BY country;", language="sql")
-        df = ranking_df.groupby("country").size().reset_index(name="total")
-        st.plotly_chart(px.bar(df.sort_values("total",ascending=False).head(10),
-                               x="country", y="total"),
-                         use_container_width=True)
-
-    elif choice == QUERY_LIST[11]:
-        st.subheader("Highest Points Holders")
-        st.code("SELECT MAX(points) FROM Rankings;", language="sql")
-        maxp = ranking_df["points"].max()
-        st.dataframe(ranking_df[ranking_df["points"]==maxp][["name","points"]])
-
-    # ================= VENUES =================
-    elif choice == QUERY_LIST[12]:
-        st.subheader("Venues with Complex")
-        st.code("SELECT venue, complex FROM Venues;", language="sql")
-        st.dataframe(venue_complex[["venue_name","complex_name"]])
-
-    elif choice == QUERY_LIST[13]:
-        st.subheader("Venues per Complex")
-        st.code("SELECT complex, COUNT(*) FROM Venues;", language="sql")
-        df = venue_complex.groupby("complex_name").size().reset_index(name="total")
-        st.plotly_chart(px.bar(df, x="complex_name", y="total"), use_container_width=True)
-
-    elif choice == QUERY_LIST[14]:
-        st.subheader("Venues in AUSTRALIA")
-        st.code("SELECT * FROM Venues WHERE country='AUSTRALIA';", language="sql")
-        st.dataframe(venues[venues["country_name"]=="AUSTRALIA"])
-
-    elif choice == QUERY_LIST[15]:
-        st.subheader("Venue Timezones")
-        st.code("SELECT venue_name, timezone FROM Venues;", language="sql")
-        st.dataframe(venues[["venue_name","timezone"]])
-
-    elif choice == QUERY_LIST[16]:
-        st.subheader("Complexes with Multiple Venues")
-        st.code("SELECT complex HAVING COUNT(*)>1;", language="sql")
-        df = venue_complex.groupby("complex_name").size().reset_index(name="total")
-        st.dataframe(df[df["total"]>1])
-
-    elif choice == QUERY_LIST[17]:
-        st.subheader("Venues by Country")
-        st.code("SELECT country, COUNT(*) FROM Venues GROUP BY country;", language="sql")
-        df = venues.groupby("country_name").size().reset_index(name="total")
-        st.plotly_chart(px.pie(df, names="country_name", values="total", hole=0.4),
-                         use_container_width=True)
-
-    elif choice == QUERY_LIST[18]:
-        st.subheader("Venues for Nacional Complex")
-        st.code("SELECT venue FROM Venues WHERE complex='Nacional';", language="sql")
-        st.dataframe(
-            venue_complex[
-                venue_complex["complex_name"]=="Nacional"
-            ][["venue_name"]]
+        st.plotly_chart(fig, use_container_width=True)
+    elif len(numeric) == 1 and labels and len(frame) > 1:
+        fig = cached_figure(
+            "sql", normalize_sql(sql),
+            lambda: px.bar(frame, x=labels[0], y=numeric[0])
         )
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# =================================================
+# RENDER
+# =================================================
+RENDERERS = [
+    render_overview,
+    render_competitions,
+    render_competitors,
+    render_venues,
+    render_dashboard,
+    render_sql_explorer,
+]
+
+if LAZY_TABS:
+    view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed")
+    RENDERERS[VIEWS.index(view)]()
+else:
+    for tab, render in zip(st.tabs(VIEWS), RENDERERS):
+        with tab:
+            render()
+
+st.sidebar.caption(f"⏱ Rerun: {(time.perf_counter() - rerun_start) * 1000:.0f} ms")
@@ -0,0 +1,269 @@
+"""
+Dashboard rerun benchmark: publishes synthetic snapshots of increasing
+size and runs app.py headless (Streamlit's AppTest) through every view,
+cold and warm, recording rerun time, data-prep and figure-build time
+and the bytes of figures and tables sent to the browser. Writes a JSON
+report that later runs can be compared against.
+
+Run from the project root:
+    python -m benchmarks.dashboard --scale 1000 10000 100000 --output dashboard.json
+    python -m benchmarks.dashboard --scale 1000 10000 100000 --compare dashboard.json
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timezone
+from benchmarks.ingest import make_payloads, git_commit
+
+APP_PATH = os.path.join(os.path.dirname(__file__), "..", "app.py")
+
+# Reruns faster than this are too noisy to flag as regressions
+MIN_COMPARE_MS = 50
+
+
+# --------------------
+# Synthetic data
+# --------------------
+def publish_snapshot(scale, snapshot_dir):
+    """
+    Parse synthetic payloads of `scale` competitor rankings into the
+    dashboard tables and publish them, with their summary tables, as a
+    snapshot, as insert_data.py does after a load.
+    Returns:
+        {table: rows}
+    """
+    import pandas as pd
+    from data_extraction.competitions import parse_competitions
+    from data_extraction.complexes import parse_complexes
+    from data_extraction.rankings import parse_rankings
+    from dashboard.loader import TABLE_SCHEMAS
+    from dashboard.aggregates import build_aggregates
+    from dashboard import snapshot
+
+    payloads = {path: json.loads(body) for path, body in make_payloads(scale).items()}
+    categories, competitions = parse_competitions(payloads["/competitions.json"])
+    complexes, venues = parse_complexes(payloads["/complexes.json"])
+    competitors, rankings = parse_rankings(payloads["/double_competitors_rankings.json"])
+
+    rows = {
+        "categories": categories,
+        "competitions": competitions,
+        "complexes": complexes,
+        "venues": venues,
+        "competitors": competitors,
+        "competitor_rankings": rankings,
+    }
+    frames = {
+        table: pd.DataFrame(rows[table], columns=list(schema)).astype(schema)
+        for table, schema in TABLE_SCHEMAS.items()
+    }
+    frames.update(build_aggregates(frames))
+    snapshot.write_snapshot(frames, snapshot_dir)
+    return {table: len(frame) for table, frame in frames.items()}
+
+
+# --------------------
+# Instrumentation
+# --------------------
+class ComputeTimer:
+    """
+    Wraps memo.memoize to time the computations behind cache misses:
+    ("figure", ...) keys count as figure build, everything else as data
+    prep. Nested computations are only counted once, by the innermost.
+    """
+
+    def __init__(self, memo):
+        self.seconds = defaultdict(float)
+        self._stack = []
+        self._memoize = memo.memoize
+        memo.memoize = self.memoize
+
+    def memoize(self, key, compute):
+        kind = "figure" if key[0] == "figure" else "prep"
+
+        def timed():
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return compute()
+            finally:
+                elapsed = time.perf_counter() - start
+                self.seconds[kind] += elapsed - self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+
+        return self._memoize(key, timed)
+
+    def take(self):
+        seconds, self.seconds = self.seconds, defaultdict(float)
+        return seconds
+
+
+def element_bytes(elements):
+    # Serialised size of the elements' messages to the browser
+    return sum(element.proto.ByteSize() for element in elements)
+
+
+def measure(at, timer, run):
+    """
+    Time one rerun started by `run()` and collect what it produced.
+    """
+    timer.take()
+    start = time.perf_counter()
+    run()
+    rerun = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"app.py raised: {at.exception[0].message}")
+
+    seconds = timer.take()
+    return {
+        "rerun_ms": round(rerun * 1000, 1),
+        "prep_ms": round(seconds["prep"] * 1000, 1),
+        "figure_build_ms": round(seconds["figure"] * 1000, 1),
+        "figures": len(at.get("plotly_chart")),
+        "figure_bytes": element_bytes(at.get("plotly_chart")),
+        "table_bytes": element_bytes(at.dataframe),
+    }
+
+
+def benchmark(scale, snapshot_dir, timeout):
+    """
+    Startup rerun with every cache empty, then for each view a cold
+    rerun (derived-frame cache cleared; the loaded tables stay cached,
+    as they do when switching views in a running app) and a warm one.
+    """
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    from dashboard import memo
+
+    # Deprecation warnings would otherwise be logged on every rerun
+    logging.getLogger("streamlit.deprecation_util").disabled = True
+
+    tables = publish_snapshot(scale, snapshot_dir)
+    timer = ComputeTimer(memo)
+
+    st.cache_data.clear()
+    memo.clear()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    result = {"scale": scale, "tables": tables, "startup": measure(at, timer, at.run), "views": {}}
+
+    try:
+        for view in at.radio[0].options:
+            memo.clear()
+            cold = measure(at, timer, lambda: at.radio[0].set_value(view).run())
+            warm = measure(at, timer, at.run)
+            result["views"][view] = {"cold": cold, "warm": warm}
+    finally:
+        memo.memoize = timer._memoize
+
+    return result
+
+
+# --------------------
+# Report
+# --------------------
+def compare(report, baseline, threshold):
+    """
+    Views whose rerun got slower, or whose figures got bigger, than in
+    `baseline` by more than `threshold` (a fraction), at matching scales.
+    Returns:
+        list of messages, empty when nothing regressed
+    """
+    previous = {run["scale"]: run["views"] for run in baseline["runs"]}
+    regressions = []
+
+    for run in report["runs"]:
+        for view, caches in run["views"].items():
+            for cache, result in caches.items():
+                before = previous.get(run["scale"], {}).get(view, {}).get(cache)
+                if not before:
+                    continue
+                label = f"{view} ({cache}) @ {run['scale']:,}"
+                if before["rerun_ms"] >= MIN_COMPARE_MS and result["rerun_ms"] > before["rerun_ms"] * (1 + threshold):
+                    regressions.append(f"{label}: {result['rerun_ms']:.0f} ms (was {before['rerun_ms']:.0f} ms)")
+                if result["figure_bytes"] > before["figure_bytes"] * (1 + threshold):
+                    regressions.append(
+                        f"{label}: {result['figure_bytes']:,} figure bytes (was {before['figure_bytes']:,})"
+                    )
+    return regressions
+
+
+def print_run(run):
+    startup = run["startup"]
+    print(
+        f"\n📦 {run['scale']:,} competitor rankings "
+        f"(startup {startup['rerun_ms']:.0f} ms, {run['tables']['competitors']:,} competitors)"
+    )
+    print(
+        f"{'view':<22}{'cache':>6}{'rerun ms':>10}{'prep ms':>10}{'figure ms':>11}"
+        f"{'figures':>9}{'figure KB':>11}{'table KB':>10}"
+    )
+    for view, caches in run["views"].items():
+        for cache, result in caches.items():
+            print(
+                f"{view:<22}{cache:>6}{result['rerun_ms']:>10.0f}{result['prep_ms']:>10.0f}"
+                f"{result['figure_build_ms']:>11.0f}{result['figures']:>9}"
+                f"{result['figure_bytes'] / 1024:>11.1f}{result['table_bytes'] / 1024:>10.1f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="competitor rankings per run")
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per rerun")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="JSON report of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing (fraction)")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # The dashboard modules read their settings at import time: read
+        # the synthetic snapshots, never the configured database
+        os.environ["DASHBOARD_SNAPSHOT_DIR"] = os.path.join(workdir, "snapshots")
+        os.environ["STORAGE_BACKEND"] = "sqlite"
+        os.environ["LOCAL_DB_PATH"] = os.path.join(workdir, "unused.sqlite")
+        os.environ.setdefault("SPORTSRADAR_API_KEY", "benchmark")
+
+        for scale in args.scale:
+            snapshot_dir = os.path.join(workdir, "snapshots")
+            os.makedirs(snapshot_dir, exist_ok=True)
+            run = benchmark(scale, snapshot_dir, args.timeout)
+            report["runs"].append(run)
+            print_run(run)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"   {message}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
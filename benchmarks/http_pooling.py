@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: requests/sec against a local HTTP server with and
+without the pooled session from data_extraction.http_client.
+
+Run from the project root:
+    python -m benchmarks.http_pooling --requests 500 --workers 8
+"""
+import time
+import argparse
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from data_extraction.http_client import create_session
+
+BODY = b'{"competitions": []}'
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so the server honours keep-alive; without TCP_NODELAY the
+    # split header/body writes stall on delayed ACKs over a reused socket
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(get, url, total, workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for response in pool.map(lambda _: get(url, timeout=10), range(total)):
+            response.raise_for_status()
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/competitions.json"
+
+    unpooled = run(requests.get, url, args.requests, args.workers)
+    session = create_session(pool_size=args.workers)
+    pooled = run(session.get, url, args.requests, args.workers)
+
+    server.shutdown()
+
+    print(f"Without pooling: {unpooled:8.1f} req/s")
+    print(f"With pooling:    {pooled:8.1f} req/s")
+    print(f"Speed-up:        {pooled / unpooled:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+Ingest benchmark: synthetic SportRadar payloads at increasing scale,
+served from a local stub server and pushed through each ingest stage
+(fetch, parse, streaming parse, SQLite bulk load). Writes a JSON report
+that later runs can be compared against to catch regressions.
+
+Run from the project root:
+    python -m benchmarks.ingest --scale 1000 10000 100000 --output ingest.json
+    python -m benchmarks.ingest --scale 1000 10000 100000 --compare ingest.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Rankings rows per scale unit; the other payloads grow with it
+COMPETITIONS_PER_RANKING = 20
+VENUES_PER_COMPLEX = 2
+RANKINGS_PER_COMPLEX = 100
+
+# Stages faster than this (or peaking under MIN_COMPARE_MB) are too
+# noisy to flag as regressions
+MIN_COMPARE_SECONDS = 0.05
+MIN_COMPARE_MB = 1.0
+
+# Columns written per table, as in insert_data.py
+TABLE_COLUMNS = {
+    "categories": ["category_id", "category_name"],
+    "competitions": ["competition_id", "competition_name", "parent_id", "type", "gender", "category_id"],
+    "complexes": ["complex_id", "complex_name"],
+    "venues": ["venue_id", "venue_name", "city_name", "country_name", "country_code", "timezone", "complex_id"],
+    "competitors": ["competitor_id", "name", "country", "country_code", "abbreviation"],
+    "competitor_rankings": [
+        "ranking_id", "ranking_name", "snapshot_date", "rank", "movement",
+        "points", "competitions_played", "competitor_id",
+    ],
+}
+
+TABLE_KEYS = {
+    "categories": "category_id",
+    "competitions": "competition_id",
+    "complexes": "complex_id",
+    "venues": "venue_id",
+    "competitors": "competitor_id",
+    "competitor_rankings": ("ranking_id", "snapshot_date", "competitor_id"),
+}
+
+COUNTRIES = [
+    ("Serbia", "SRB"), ("Spain", "ESP"), ("Switzerland", "SUI"), ("France", "FRA"),
+    ("Czechia", "CZE"), ("Poland", "POL"), ("Brazil", "BRA"), ("Japan", "JPN"),
+    ("USA", "USA"), ("Australia", "AUS"), ("Germany", "GER"), ("Türkiye", "TUR"),
+]
+FIRST_NAMES = ["Novak", "Iga", "Rafael", "Aryna", "Jiří", "Carlos", "Zoë", "Holger", "Mirra", "Stéphane"]
+LAST_NAMES = ["Đoković", "Świątek", "Nadal", "Müller", "Lehečka", "Alcaraz", "O'Brien", "Rune", "Andreeva", "Houdé"]
+
+
+# --------------------
+# Synthetic payloads
+# --------------------
+def make_payloads(scale, seed=0):
+    """
+    JSON bodies shaped like the SportRadar responses, with `scale`
+    competitor rankings split over two rankings.
+    Returns:
+        {path: encoded body}
+    """
+    rng = random.Random(seed)
+
+    categories = [{"id": f"sr:category:{i}", "name": f"Category {i}"} for i in range(max(scale // 500, 5))]
+    competitions = []
+    for i in range(max(scale // COMPETITIONS_PER_RANKING, 10)):
+        competition = {
+            "id": f"sr:competition:{i}",
+            "name": f"{rng.choice(LAST_NAMES)} Open {i}",
+            "type": rng.choice(["singles", "doubles", "mixed"]),
+            "gender": rng.choice(["men", "women", "mixed"]),
+            "category": rng.choice(categories),
+        }
+        if i and rng.random() < 0.5:
+            competition["parent_id"] = f"sr:competition:{rng.randrange(i)}"
+        competitions.append(competition)
+
+    complexes = []
+    for i in range(max(scale // RANKINGS_PER_COMPLEX, 5)):
+        country, code = rng.choice(COUNTRIES)
+        complexes.append({
+            "id": f"sr:complex:{i}",
+            "name": f"Complex {i}",
+            "venues": [
+                {
+                    "id": f"sr:venue:{i * VENUES_PER_COMPLEX + v}",
+                    "name": f"Court {v + 1}",
+                    "city_name": f"City {i % 500}",
+                    "country_name": country,
+                    "country_code": code,
+                    "timezone": "Europe/Paris",
+                }
+                for v in range(VENUES_PER_COMPLEX)
+            ],
+        })
+
+    rankings = []
+    for r, name in enumerate(["ATP", "WTA"]):
+        rows = []
+        for rank in range(1, scale // 2 + (scale % 2 if r == 0 else 0) + 1):
+            country, code = rng.choice(COUNTRIES)
+            rows.append({
+                "rank": rank,
+                "movement": rng.randint(-20, 20),
+                "points": max(20000 // rank, 1) + rng.randrange(50),
+                "competitions_played": rng.randrange(40),
+                "competitor": {
+                    "id": f"sr:competitor:{r}{rank}",
+                    "name": f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)}",
+                    "country": country,
+                    "country_code": code,
+                    "abbreviation": f"{rng.choice(LAST_NAMES)[:3].upper()}",
+                },
+            })
+        rankings.append({
+            "type_id": r + 1, "name": name, "year": 2026, "week": 40,
+            "gender": "men" if r == 0 else "women",
+            "competitor_rankings": rows,
+        })
+
+    return {
+        "/competitions.json": json.dumps({"competitions": competitions}).encode(),
+        "/complexes.json": json.dumps({"complexes": complexes}).encode(),
+        "/double_competitors_rankings.json": json.dumps({"rankings": rankings}).encode(),
+    }
+
+
+# --------------------
+# Stub server
+# --------------------
+class PayloadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    payloads = {}
+
+    def do_GET(self):
+        body = self.payloads.get(self.path.split("?", 1)[0])
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PayloadHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --------------------
+# Stages
+# --------------------
+def project(rows, table):
+    columns = TABLE_COLUMNS[table]
+    return ({c: row.get(c) for c in columns} for row in rows)
+
+
+def ingest_stages(payloads, client):
+    """
+    (stage, payload_bytes, run) for every ingest stage; `run` returns
+    the number of rows the stage produced or wrote. Load stages write
+    into `client` in foreign-key order.
+    """
+    from data_extraction.competitions import fetch_competitions, parse_competitions
+    from data_extraction.complexes import fetch_complexes, parse_complexes
+    from data_extraction.rankings import fetch_rankings, parse_rankings, stream_rankings, ijson
+    from databases.bulk_loader import bulk_load
+
+    decoded = {path: json.loads(body) for path, body in payloads.items()}
+    parsed = {}
+
+    def count(tables):
+        return sum(len(rows) for rows in tables)
+
+    def parse(name, parser, path):
+        def run():
+            parsed[name] = parser(decoded[path])
+            return count(parsed[name])
+        return run
+
+    def stream():
+        return sum(count(chunk) for chunk in stream_rankings())
+
+    def load(table, name, part):
+        def run():
+            return bulk_load(client, table, project(parsed[name][part], table), key=TABLE_KEYS[table])["rows"]
+        return run
+
+    competitions = payloads["/competitions.json"]
+    complexes = payloads["/complexes.json"]
+    rankings = payloads["/double_competitors_rankings.json"]
+
+    stages = [
+        ("fetch_competitions", len(competitions), lambda: count(fetch_competitions())),
+        ("fetch_complexes", len(complexes), lambda: count(fetch_complexes())),
+        ("fetch_rankings", len(rankings), lambda: count(fetch_rankings())),
+        ("parse_competitions", len(competitions), parse("competitions", parse_competitions, "/competitions.json")),
+        ("parse_complexes", len(complexes), parse("complexes", parse_complexes, "/complexes.json")),
+        ("parse_rankings", len(rankings), parse("rankings", parse_rankings, "/double_competitors_rankings.json")),
+    ]
+    if ijson is not None:
+        stages.append(("stream_rankings", len(rankings), stream))
+
+    stages += [
+        ("load_categories", 0, load("categories", "competitions", 0)),
+        ("load_competitions", 0, load("competitions", "competitions", 1)),
+        ("load_complexes", 0, load("complexes", "complexes", 0)),
+        ("load_venues", 0, load("venues", "complexes", 1)),
+        ("load_competitors", 0, load("competitors", "rankings", 0)),
+        ("load_competitor_rankings", 0, load("competitor_rankings", "rankings", 1)),
+    ]
+    return stages
+
+
+def run_pass(payloads, workdir, name, memory=False):
+    """
+    One pass over every stage against a fresh SQLite file.
+    Returns:
+        {stage: {"rows", "seconds", "payload_bytes"[, "peak_mb"]}}
+    """
+    from databases.sqlite_client import LocalClient
+
+    client = LocalClient(os.path.join(workdir, f"{name}.sqlite"))
+    results = {}
+
+    for stage, payload_bytes, run in ingest_stages(payloads, client):
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        rows = run()
+        seconds = time.perf_counter() - start
+
+        results[stage] = {"rows": rows, "seconds": seconds, "payload_bytes": payload_bytes}
+        if memory:
+            results[stage]["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+
+    # Recent writes may still sit in the write-ahead log
+    files = [client.path, client.path + "-wal"]
+    results["db_file"] = {"bytes": sum(os.path.getsize(f) for f in files if os.path.exists(f))}
+    return results
+
+
+def benchmark(scale, repeat, memory, workdir):
+    """
+    Best-of-`repeat` timings per stage at one scale, plus the peak
+    traced memory from a separate pass (tracing slows the stages down,
+    so it is never timed).
+    """
+    payloads = make_payloads(scale)
+    PayloadHandler.payloads = payloads
+
+    best = {}
+    for attempt in range(repeat):
+        timings = run_pass(payloads, workdir, f"{scale}-{attempt}")
+        db_bytes = timings.pop("db_file")["bytes"]
+        for stage, result in timings.items():
+            if stage not in best or result["seconds"] < best[stage]["seconds"]:
+                best[stage] = result
+
+    if memory:
+        traced = run_pass(payloads, workdir, f"{scale}-memory", memory=True)
+        for stage, result in best.items():
+            result["peak_mb"] = round(traced[stage]["peak_mb"], 2)
+
+    for result in best.values():
+        result["rows_per_sec"] = round(result["rows"] / result["seconds"]) if result["seconds"] else 0
+        result["seconds"] = round(result["seconds"], 4)
+
+    return {"scale": scale, "db_bytes": db_bytes, "stages": best}
+
+
+# --------------------
+# Report
+# --------------------
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline, threshold):
+    """
+    Stages that got slower (rows/sec) or hungrier (peak MB) than in
+    `baseline` by more than `threshold` (a fraction), at matching scales.
+    Stages too short or too small to measure reliably are skipped.
+    Returns:
+        list of messages, empty when nothing regressed
+    """
+    previous = {run["scale"]: run["stages"] for run in baseline["runs"]}
+    regressions = []
+
+    for run in report["runs"]:
+        for stage, result in run["stages"].items():
+            before = previous.get(run["scale"], {}).get(stage)
+            if not before:
+                continue
+            if before["seconds"] >= MIN_COMPARE_SECONDS and result["rows_per_sec"] < before["rows_per_sec"] * (1 - threshold):
+                regressions.append(
+                    f"{stage} @ {run['scale']:,}: {result['rows_per_sec']:,} rows/s "
+                    f"(was {before['rows_per_sec']:,})"
+                )
+            if before.get("peak_mb", 0) >= MIN_COMPARE_MB and result.get("peak_mb", 0) > before["peak_mb"] * (1 + threshold):
+                regressions.append(
+                    f"{stage} @ {run['scale']:,}: peak {result['peak_mb']:.1f} MB "
+                    f"(was {before['peak_mb']:.1f} MB)"
+                )
+    return regressions
+
+
+def print_run(run):
+    print(f"\n📦 {run['scale']:,} competitor rankings (SQLite file {run['db_bytes'] / 1e6:.1f} MB)")
+    print(f"{'stage':<26}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'payload MB':>12}{'peak MB':>10}")
+    for stage, result in run["stages"].items():
+        payload = f"{result['payload_bytes'] / 1e6:.1f}" if result["payload_bytes"] else "-"
+        peak = f"{result['peak_mb']:.1f}" if "peak_mb" in result else "-"
+        print(
+            f"{stage:<26}{result['rows']:>10,}{result['seconds']:>10.3f}"
+            f"{result['rows_per_sec']:>12,}{payload:>12}{peak:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="competitor rankings per run (1k-1M)")
+    parser.add_argument("--repeat", type=int, default=1, help="timed passes per scale (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced-memory pass")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="JSON report of an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing (fraction)")
+    args = parser.parse_args()
+
+    server = start_server()
+
+    # The extractors read their settings at import time: point them at
+    # the stub, skip the response cache and lift the API rate limit
+    os.environ["SPORTSRADAR_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}"
+    os.environ.setdefault("SPORTSRADAR_API_KEY", "benchmark")
+    os.environ["SPORTSRADAR_CACHE"] = "0"
+    os.environ["SPORTSRADAR_QPS"] = "1000000"
+    os.environ["SPORTSRADAR_BURST"] = "1000"
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scale:
+            run = benchmark(scale, args.repeat, not args.no_memory, workdir)
+            report["runs"].append(run)
+            print_run(run)
+
+    server.shutdown()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"   {message}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# Summary tables computed once per load, with the source tables they
+# depend on (used to skip recomputing unchanged ones)
+AGGREGATE_SOURCES = {
+    "agg_competitions": {"competitions", "categories"},
+    "agg_venues": {"venues", "complexes"},
+    "agg_country_rankings": {"competitors", "competitor_rankings"},
+}
+
+# Width of the rank bands agg_country_rankings is split into
+RANK_BAND = 50
+
+# Columns a summary must have to be reused; one read from an older
+# snapshot without them is rebuilt
+AGGREGATE_COLUMNS = {
+    "agg_country_rankings": {"rank_band", "points_counted", "improved"},
+}
+
+
+def latest_rankings(rankings):
+    """
+    Keep only the most recent weekly snapshot of each ranking.
+    """
+    if "snapshot_date" not in rankings.columns or rankings.empty:
+        return rankings
+    latest = rankings.groupby("ranking_id")["snapshot_date"].transform("max")
+    return rankings[rankings["snapshot_date"] == latest]
+
+
+def competitions_summary(competitions, categories):
+    """
+    Competition counts per (category, gender, type).
+    """
+    return (
+        competitions
+        .merge(categories, on="category_id", how="left")
+        .groupby(["category_name", "gender", "type"], dropna=False, observed=True)
+        .size()
+        .reset_index(name="total")
+    )
+
+
+def venues_summary(venues, complexes):
+    """
+    Venue counts per (country, complex, city, timezone).
+    """
+    return (
+        venues
+        .merge(complexes, on="complex_id", how="left")
+        .groupby(["country_name", "complex_name", "city_name", "timezone"], dropna=False, observed=True)
+        .size()
+        .reset_index(name="venues")
+    )
+
+
+def country_rankings_summary(competitors, rankings):
+    """
+    Ranked competitors, points and rank movements (improved, declined,
+    stable) per (country, band of RANK_BAND ranks) for the latest
+    snapshot, so any rank range made of whole bands rolls up from it
+    (see rank_bands). Competitors without a country are kept too.
+    """
+    ranked = competitors.merge(
+        latest_rankings(rankings), on="competitor_id", how="inner"
+    ).dropna(subset=["rank"])
+    movement = ranked["movement"].fillna(0)
+    ranked = ranked.assign(
+        rank_band=(ranked["rank"] - 1) // RANK_BAND,
+        improved=movement > 0,
+        declined=movement < 0,
+        stable=movement == 0,
+    )
+
+    return (
+        ranked
+        .groupby(["country", "rank_band"], observed=True, dropna=False)
+        .agg(
+            total=("competitor_id", "size"),
+            total_points=("points", "sum"),
+            points_counted=("points", "count"),
+            improved=("improved", "sum"),
+            declined=("declined", "sum"),
+            stable=("stable", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def rank_bands(rank_range, max_rank):
+    """
+    Bands of agg_country_rankings covering exactly `rank_range`, or None
+    when the range does not start and end on band edges.
+    """
+    low, high = rank_range
+    if (low - 1) % RANK_BAND or (high % RANK_BAND and high < max_rank):
+        return None
+    return list(range((low - 1) // RANK_BAND, (min(high, max_rank) - 1) // RANK_BAND + 1))
+
+
+BUILDERS = {
+    "agg_competitions": lambda f: competitions_summary(f["competitions"], f["categories"]),
+    "agg_venues": lambda f: venues_summary(f["venues"], f["complexes"]),
+    "agg_country_rankings": lambda f: country_rankings_summary(f["competitors"], f["competitor_rankings"]),
+}
+
+
+def is_current(name, frame):
+    return AGGREGATE_COLUMNS.get(name, set()) <= set(frame.columns)
+
+
+def build_aggregates(frames, previous=None, changed_tables=None):
+    """
+    Return every summary table.
+    Aggregates already present in `frames` (e.g. read from a snapshot)
+    are used as-is. With `previous` aggregates and the set of
+    `changed_tables` from the last load, only summaries whose sources
+    changed are recomputed; the rest are carried over.
+    """
+    aggregates = {}
+
+    for name, builder in BUILDERS.items():
+        if name in frames and is_current(name, frames[name]):
+            aggregates[name] = frames[name]
+        elif (
+            previous is not None and name in previous
+            and is_current(name, previous[name])
+            and changed_tables is not None
+            and not AGGREGATE_SOURCES[name] & set(changed_tables)
+        ):
+            aggregates[name] = previous[name]
+        else:
+            aggregates[name] = builder(frames)
+
+    return aggregates
+
+
+def filter_in(frame, column, values):
+    return frame[frame[column].isin(values)] if values else frame
+
+
+def rollup(frame, by, measure="total"):
+    """
+    Re-aggregate a summary table to coarser groups: O(groups), not O(rows).
+    """
+    return (
+        frame
+        .groupby(by, observed=True)[measure]
+        .sum()
+        .reset_index()
+    )
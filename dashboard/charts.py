@@ -0,0 +1,65 @@
+import os
+import numpy as np
+import plotly.express as px
+
+# Most points a scatter sends to the browser; larger frames are
+# downsampled first (per chart override: the `budget` argument)
+POINT_BUDGET = int(os.getenv("DASHBOARD_POINT_BUDGET", "5000"))
+
+# Scatters with at least this many points are drawn with WebGL
+WEBGL_MIN_POINTS = int(os.getenv("DASHBOARD_WEBGL_MIN_POINTS", "1000"))
+
+
+def downsample(frame, x, y, budget=POINT_BUDGET, keep_top=None):
+    """
+    At most `budget` rows of `frame` that keep the shape of the y-vs-x
+    scatter: the `keep_top` rows with the lowest x (e.g. the best ranks;
+    a fifth of the budget by default) are all kept, and the rest are
+    cut into equal-count x bins of which only the lowest and highest y
+    survive, so outliers are never dropped.
+    """
+    if len(frame) <= budget:
+        return frame
+
+    frame = frame.dropna(subset=[x, y])
+    if len(frame) <= budget:
+        return frame
+
+    keep_top = budget // 5 if keep_top is None else min(keep_top, budget)
+    order = np.argsort(frame[x].to_numpy(dtype=float), kind="stable")
+    head, rest = order[:keep_top], order[keep_top:]
+
+    bins = max((budget - keep_top) // 2, 1)
+    edges = np.linspace(0, len(rest), bins + 1).astype(int)
+    bin_of = np.repeat(np.arange(bins), np.diff(edges))
+
+    # Within each bin (contiguous after sorting by bin, then y), the
+    # first row has the lowest y and the last row the highest
+    values = frame[y].to_numpy(dtype=float)[rest]
+    by_bin = np.lexsort((values, bin_of))
+    extremes = np.concatenate([by_bin[edges[:-1]], by_bin[edges[1:] - 1]])
+
+    keep = np.unique(np.concatenate([head, rest[extremes]]))
+    return frame.iloc[keep]
+
+
+def scatter(frame, x, y, budget=POINT_BUDGET, **kwargs):
+    """
+    px.scatter over a downsampled `frame`, rendered with WebGL once it
+    has WEBGL_MIN_POINTS points. Downsampled charts are labelled with
+    the number of points shown.
+    """
+    shown = downsample(frame, x, y, budget)
+    fig = px.scatter(
+        shown, x=x, y=y,
+        render_mode="webgl" if len(shown) >= WEBGL_MIN_POINTS else "svg",
+        **kwargs
+    )
+
+    if len(shown) < len(frame):
+        fig.add_annotation(
+            text=f"showing {len(shown):,} of {len(frame):,} points",
+            xref="paper", yref="paper", x=1, y=1.06,
+            showarrow=False, font={"size": 11},
+        )
+    return fig
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import take
+from dashboard.aggregates import latest_rankings
+
+# Primary key of each table that other tables point at
+INDEX_KEYS = {
+    "categories": "category_id",
+    "competitions": "competition_id",
+    "competitors": "competitor_id",
+    "complexes": "complex_id",
+}
+
+
+class JoinIndex:
+    """
+    Hash indexes over the primary keys of the loaded tables, plus the
+    competition parent -> children adjacency. Built once per data
+    version; joins then become positional lookups instead of merges.
+    """
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.indexes = {
+            table: pd.Index(frames[table][key])
+            for table, key in INDEX_KEYS.items() if table in frames
+        }
+
+        # Children of competition i are child_positions[offsets[i]:offsets[i + 1]]
+        parents = self.positions("competitions", frames["competitions"]["parent_id"])
+        has_parent = parents >= 0
+        children = np.flatnonzero(has_parent)
+        self.child_positions = children[np.argsort(parents[has_parent], kind="stable")]
+        self.child_offsets = np.concatenate([
+            [0], np.cumsum(np.bincount(parents[has_parent], minlength=len(parents)))
+        ])
+
+    def positions(self, table, keys):
+        """
+        Row position in `table` of each key, -1 where there is none.
+        """
+        return self.indexes[table].get_indexer(keys)
+
+    def lookup(self, table, keys, columns):
+        """
+        `columns` of `table` for each key, aligned with `keys`
+        (missing keys give missing values).
+        """
+        positions = self.positions(table, keys)
+        source = self.frames[table]
+        return pd.DataFrame({
+            column: take(source[column].array, positions, allow_fill=True)
+            for column in columns
+        })
+
+    def join(self, frame, table, on, columns=None, how="left"):
+        """
+        Equivalent of frame.merge(table, on=on, how=how) for a key that
+        is unique in `table`; row order of `frame` is kept.
+        """
+        source = self.frames[table]
+        columns = list(columns or [c for c in source.columns if c not in frame.columns])
+        positions = self.positions(table, frame[on])
+
+        if how == "inner":
+            keep = positions >= 0
+            frame, positions = frame[keep], positions[keep]
+
+        result = frame.reset_index(drop=True)
+        for column in columns:
+            result[column] = take(source[column].array, positions, allow_fill=True)
+        return result
+
+    def children(self, competition_id):
+        """
+        Direct sub-competitions of a competition.
+        """
+        position = self.positions("competitions", [competition_id])[0]
+        if position < 0:
+            return self.frames["competitions"].iloc[0:0]
+        start, end = self.child_offsets[position], self.child_offsets[position + 1]
+        return self.frames["competitions"].iloc[self.child_positions[start:end]]
+
+    def parents(self):
+        """
+        Competitions with at least one sub-competition.
+        """
+        return self.frames["competitions"].iloc[np.flatnonzero(np.diff(self.child_offsets))]
+
+    def memory_usage(self):
+        return (
+            sum(int(index.memory_usage(deep=True)) for index in self.indexes.values())
+            + self.child_positions.nbytes
+            + self.child_offsets.nbytes
+        )
+
+
+def build_joins(frames, index):
+    """
+    The dashboard's three pre-joined frames, through `index`.
+    Rankings are stored as weekly snapshots; only the latest week of
+    each ranking is joined.
+    """
+    competition_category = index.join(
+        frames["competitions"], "categories", on="category_id"
+    )
+
+    rankings = latest_rankings(frames["competitor_rankings"]).dropna(subset=["rank"])
+    ranking_df = index.join(rankings, "competitors", on="competitor_id", how="inner")
+    ranking_df = ranking_df[
+        list(frames["competitors"].columns)
+        + [c for c in rankings.columns if c != "competitor_id"]
+    ]
+
+    venue_complex = index.join(frames["venues"], "complexes", on="complex_id")
+
+    return competition_category, ranking_df, venue_complex
@@ -0,0 +1,183 @@
+import os
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+# PostgREST caps responses at 1000 rows by default
+PAGE_SIZE = int(os.getenv("DASHBOARD_PAGE_SIZE", "1000"))
+PAGE_WORKERS = int(os.getenv("DASHBOARD_PAGE_WORKERS", "4"))
+
+# Tables loaded concurrently at dashboard cold start
+TABLE_WORKERS = int(os.getenv("DASHBOARD_TABLE_WORKERS", "6"))
+
+# Columns the dashboard actually uses, with their declared dtypes.
+# Ids stay strings (they are join keys across tables); low-cardinality
+# labels are categoricals and numbers the smallest nullable int that fits
+TABLE_SCHEMAS = {
+    "categories": {
+        "category_id": "string",
+        "category_name": "category",
+    },
+    "competitions": {
+        "competition_id": "string",
+        "competition_name": "string",
+        "parent_id": "string",
+        "type": "category",
+        "gender": "category",
+        "category_id": "string",
+    },
+    "competitors": {
+        "competitor_id": "string",
+        "name": "string",
+        "country": "category",
+        "abbreviation": "string",
+    },
+    "competitor_rankings": {
+        "ranking_id": "category",
+        "snapshot_date": "string",
+        "competitor_id": "string",
+        "rank": "Int32",
+        "movement": "Int16",
+        "points": "Int32",
+    },
+    "complexes": {
+        "complex_id": "string",
+        "complex_name": "string",
+    },
+    "venues": {
+        "venue_id": "string",
+        "venue_name": "string",
+        "city_name": "category",
+        "country_name": "category",
+        "timezone": "category",
+        "complex_id": "string",
+    },
+}
+
+# Stable ordering so range pages never overlap or skip rows
+ORDER_BY = {
+    "categories": "category_id",
+    "competitions": "competition_id",
+    "competitors": "competitor_id",
+    "competitor_rankings": "rank_id",
+    "complexes": "complex_id",
+    "venues": "venue_id",
+}
+
+
+def fetch_rows(client, table, columns, page_size=PAGE_SIZE, workers=PAGE_WORKERS):
+    """
+    Read every row of `table` in range pages.
+    The first page also returns the exact row count; the remaining
+    pages are then requested concurrently. If the server caps pages
+    below `page_size`, the cap it actually applied is used as the step.
+    """
+    def page(start, size):
+        return (
+            client.table(table)
+            .select(",".join(columns))
+            .order(ORDER_BY[table])
+            .range(start, start + size - 1)
+            .execute()
+            .data
+        )
+
+    first = (
+        client.table(table)
+        .select(",".join(columns), count="exact")
+        .order(ORDER_BY[table])
+        .range(0, page_size - 1)
+        .execute()
+    )
+    rows = list(first.data)
+    total = first.count if first.count is not None else len(rows)
+    step = len(rows)
+
+    if not step or total <= step:
+        return rows
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pages = pool.map(lambda start: page(start, step), range(step, total, step))
+        for data in pages:
+            rows.extend(data)
+
+    return rows
+
+
+def load_frame(client, table, columns=None):
+    """
+    Load `table` (optionally only `columns`) into a DataFrame with the
+    dtypes declared in TABLE_SCHEMAS.
+    """
+    schema = TABLE_SCHEMAS[table]
+    columns = list(columns or schema)
+
+    frame = pd.DataFrame(fetch_rows(client, table, columns), columns=columns)
+    return frame.astype({column: schema[column] for column in columns})
+
+
+def compact_frame(table, frame):
+    """
+    Cast the columns of `frame` that TABLE_SCHEMAS declares for `table`
+    (e.g. frames from a snapshot written with older dtypes). Columns
+    already in their declared dtype are left untouched.
+    """
+    schema = TABLE_SCHEMAS.get(table, {})
+    return frame.astype({
+        column: schema[column] for column in frame.columns
+        if column in schema and frame[column].dtype != schema[column]
+    })
+
+
+def memory_report(frames):
+    """
+    Bytes per frame as built from the JSON rows (object strings, Int64)
+    and in its current dtypes.
+    Returns:
+        dict of table name -> (plain bytes, current bytes)
+    """
+    report = {}
+    for table, frame in frames.items():
+        plain = frame.astype({
+            column: "Int64" if pd.api.types.is_integer_dtype(dtype) else object
+            for column, dtype in frame.dtypes.items()
+            if not pd.api.types.is_float_dtype(dtype)
+        })
+        report[table] = (
+            int(plain.memory_usage(deep=True).sum()),
+            int(frame.memory_usage(deep=True).sum()),
+        )
+    return report
+
+
+def format_memory_report(report):
+    lines = []
+    for table, (plain, current) in report.items():
+        saved = 1 - current / plain if plain else 0
+        lines.append(f"{table}: {plain / 1024:.0f} KB → {current / 1024:.0f} KB (-{saved:.0%})")
+    return lines
+
+
+def load_tables(client, tables=None, workers=TABLE_WORKERS):
+    """
+    Load several tables concurrently, so a cold start costs roughly the
+    slowest table rather than the sum of all of them.
+    Returns:
+        frames: dict of table name -> DataFrame
+        timings: dict of table name -> seconds, plus "total"
+    """
+    tables = list(tables or TABLE_SCHEMAS)
+    start = time.perf_counter()
+
+    def timed(table):
+        table_start = time.perf_counter()
+        frame = load_frame(client, table)
+        return frame, time.perf_counter() - table_start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(tables, pool.map(timed, tables)))
+
+    frames = {table: frame for table, (frame, _) in results.items()}
+    timings = {table: seconds for table, (_, seconds) in results.items()}
+    timings["total"] = time.perf_counter() - start
+    return frames, timings
@@ -0,0 +1,140 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+
+# Bounds for the derived-frame cache shared by all sessions in a process
+MAX_ENTRIES = int(os.getenv("DASHBOARD_MEMO_ENTRIES", "64"))
+MAX_BYTES = int(os.getenv("DASHBOARD_MEMO_MB", "256")) * 1024 * 1024
+
+
+# Per-point trace and marker attributes that make up most of a figure
+TRACE_ARRAYS = (
+    "x", "y", "z", "values", "labels", "parents", "ids", "text",
+    "hovertext", "customdata", "lat", "lon", "r", "theta",
+)
+MARKER_ARRAYS = ("color", "colors", "size")
+
+
+def array_bytes(values):
+    if values is None or isinstance(values, (str, int, float)):
+        return 0
+    array = np.asarray(values)
+    if array.dtype == object:
+        return int(pd.Series(array.ravel()).memory_usage(deep=True, index=False))
+    return array.nbytes
+
+
+def figure_bytes(figure):
+    """
+    Approximate size of a plotly figure from its traces' data arrays,
+    without serialising it (the layout is small and ignored).
+    """
+    total = 0
+    for trace in figure.data:
+        marker = getattr(trace, "marker", None)
+        total += sum(array_bytes(getattr(trace, name, None)) for name in TRACE_ARRAYS)
+        total += sum(array_bytes(getattr(marker, name, None)) for name in MARKER_ARRAYS)
+    return total
+
+
+def frame_bytes(value):
+    """
+    Approximate in-memory size of a DataFrame, a plotly figure (by its
+    data arrays), a numpy array, any object with a memory_usage()
+    method, or a tuple/dict of them.
+    """
+    if hasattr(value, "to_plotly_json"):
+        return figure_bytes(value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage())
+    if isinstance(value, dict):
+        return sum(frame_bytes(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(frame_bytes(v) for v in value)
+    return 0
+
+
+class FrameCache:
+    """
+    Thread-safe LRU cache of derived DataFrames, bounded by entry count
+    and total memory. Cached frames are shared, so callers must not
+    modify them in place.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        # Computed outside the lock so other sessions aren't blocked
+        value = compute()
+        size = frame_bytes(value)
+
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                self._evict()
+
+        return value
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_cache = FrameCache()
+
+
+def memoize(key, compute):
+    """
+    Return the cached value for `key`, computing it with `compute()` on
+    a miss. Keys should include the data version and the normalised
+    filter state that the value depends on.
+    """
+    return _cache.get_or_compute(key, compute)
+
+
+def stats():
+    return _cache.stats()
+
+
+def clear():
+    _cache.clear()
@@ -0,0 +1,18 @@
+from collections import namedtuple
+
+# Normalised sidebar filter state; hashable, so it can key a cache
+FilterState = namedtuple("FilterState", ["categories", "genders", "rank_range", "countries"])
+
+
+def normalize_filters(categories=(), genders=(), rank_range=None, countries=()):
+    """
+    Canonical form of the sidebar selections: de-duplicated, sorted
+    tuples, so the same filters in a different click order share one
+    cache entry.
+    """
+    return FilterState(
+        tuple(sorted(set(categories or ()))),
+        tuple(sorted(set(genders or ()))),
+        tuple(int(bound) for bound in rank_range) if rank_range else None,
+        tuple(sorted(set(countries or ()))),
+    )
@@ -0,0 +1,263 @@
+import os
+import re
+import bisect
+import unicodedata
+import numpy as np
+import pandas as pd
+
+# Minimum Dice similarity (2 * shared / total padded trigrams) between
+# a query word and a name word for a fuzzy match. 0.4 lets one typo
+# through in words of five letters or more ("alcarez" -> "alcaraz" 0.57,
+# "nadl" -> "nadal" 0.44)
+FUZZY_THRESHOLD = float(os.getenv("DASHBOARD_SEARCH_FUZZY_THRESHOLD", "0.4"))
+
+# Letters that NFKD does not split into base letter + accent
+_UNDECOMPOSED = str.maketrans({"đ": "d", "ø": "o", "ł": "l", "æ": "ae", "œ": "oe", "þ": "th", "ı": "i"})
+
+# Accents and other combining marks (Basic Multilingual Plane), removed
+_COMBINING = dict.fromkeys(c for c in range(0x10000) if unicodedata.combining(chr(c)))
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def fold(text):
+    """
+    Search form of a name: case- and accent-folded, with punctuation
+    collapsed to single spaces ("Đoković-Müller" -> "dokovic muller").
+    """
+    text = str(text).casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text.translate(_UNDECOMPOSED)).translate(_COMBINING)
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _trigram_postings(texts):
+    """
+    Padded-trigram postings of `texts` (padding makes word starts and
+    ends trigrams too: " pl", "er "): the sorted ids of the texts that
+    contain gram code g are ids[offsets[g]:offsets[g + 1]].
+    Returns:
+        ids, offsets, {gram: code}, distinct grams of each text
+    """
+    size = max(len(texts), 1)
+    grams = [t[i:i + 3] for t in (f" {t} " for t in texts) for i in range(len(t) - 2)]
+    text_ids = np.repeat(np.arange(len(texts), dtype=np.int64), [len(t) for t in texts])
+    gram_codes, gram_names = pd.factorize(np.array(grams, dtype=object))
+    pairs = np.sort(gram_codes.astype(np.int64) * size + text_ids)
+    pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+    ids = (pairs % size).astype(np.int32)
+    offsets = np.searchsorted(pairs // size, np.arange(len(gram_names) + 1))
+    codes = {gram: code for code, gram in enumerate(gram_names)}
+    return ids, offsets, codes, np.bincount(ids, minlength=len(texts))
+
+
+def _csr(keys, values, size):
+    """
+    Group `values` by integer `keys` (0 <= key < size): values for key k
+    are grouped[offsets[k]:offsets[k + 1]].
+    """
+    order = np.argsort(keys, kind="stable")
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+    return values[order], offsets
+
+
+def _gather(grouped, offsets, keys):
+    """
+    Concatenation of the groups of `keys`, in order.
+    """
+    starts, ends = offsets[keys], offsets[np.asarray(keys) + 1]
+    lengths = ends - starts
+    steps = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return grouped[steps + np.arange(lengths.sum())]
+
+
+class NameIndex:
+    """
+    Trigram and word-prefix index over the folded names (and other text
+    `fields`) of a frame, returning matching ids ranked by relevance.
+    Each distinct folded name is indexed once however many rows share
+    it, and queries are matched literally, so regex characters are
+    harmless.
+    """
+
+    def __init__(self, frame, id_column="competitor_id", fields=("name", "abbreviation")):
+        # Integer code per row, so results are de-duplicated without hashing ids
+        self.id_codes, self.ids = pd.factorize(frame[id_column].to_numpy())
+
+        values, rows = [], []
+        for field in fields:
+            present = frame[field].notna().to_numpy()
+            values.extend(frame[field][present].tolist())
+            rows.append(np.flatnonzero(present))
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+
+        folds = {}
+        folded = np.array([folds.setdefault(v, fold(v)) for v in values], dtype=object)
+        rows, folded = rows[folded != ""], folded[folded != ""]
+
+        # Documents are the distinct folded texts
+        doc_of_row, texts = pd.factorize(folded)
+        self.texts = np.asarray(texts, dtype=object)
+        self.lengths = np.array([len(t) for t in self.texts], dtype=np.int64)
+        self.doc_rows, self.doc_offsets = _csr(doc_of_row, rows, len(texts))
+
+        # Documents in text order, for name-prefix ranking
+        self.sorted_docs = np.argsort(self.texts, kind="stable")
+        self.sorted_texts = list(self.texts[self.sorted_docs])
+
+        # Trigram postings of the documents, for substring queries
+        self.posting_docs, self.posting_offsets, self.gram_codes, _ = _trigram_postings(self.texts)
+
+        # Distinct words, sorted (prefix queries), with the documents
+        # each appears in and their own trigram postings (fuzzy queries)
+        split = [t.split() for t in self.texts]
+        word_codes, words = pd.factorize(
+            np.array([word for ws in split for word in ws], dtype=object), sort=True
+        )
+        word_docs = np.repeat(np.arange(len(split), dtype=np.int64), [len(ws) for ws in split])
+        pairs = np.unique(word_codes.astype(np.int64) * max(len(split), 1) + word_docs)
+        self.words = list(words)
+        self.word_docs = (pairs % max(len(split), 1)).astype(np.int32)
+        self.word_offsets = np.searchsorted(pairs // max(len(split), 1), np.arange(len(words) + 1))
+        (
+            self.word_posting_ids, self.word_posting_offsets,
+            self.word_gram_codes, self.word_grams,
+        ) = _trigram_postings(self.words)
+
+    def postings(self, gram):
+        code = self.gram_codes.get(gram)
+        if code is None:
+            return self.posting_docs[:0]
+        return self.posting_docs[self.posting_offsets[code]:self.posting_offsets[code + 1]]
+
+    def word_postings(self, gram):
+        code = self.word_gram_codes.get(gram)
+        if code is None:
+            return self.word_posting_ids[:0]
+        return self.word_posting_ids[self.word_posting_offsets[code]:self.word_posting_offsets[code + 1]]
+
+    def _docs_of_words(self, words):
+        return _gather(self.word_docs, self.word_offsets, words)
+
+    def _prefix_docs(self, query):
+        start = bisect.bisect_left(self.words, query)
+        end = bisect.bisect_left(self.words, query + "\uffff")
+        return np.unique(self.word_docs[self.word_offsets[start]:self.word_offsets[end]])
+
+    def _name_prefix_docs(self, query):
+        start = bisect.bisect_left(self.sorted_texts, query)
+        end = bisect.bisect_left(self.sorted_texts, query + "\uffff")
+        return self.sorted_docs[start:end]
+
+    def _substring_docs(self, query):
+        lists = sorted((self.postings(g) for g in trigrams(query)), key=len)
+        docs = lists[0]
+        for other in lists[1:]:
+            if not len(docs):
+                break
+            docs = np.intersect1d(docs, other, assume_unique=True)
+
+        if len(query) == 3 or not len(docs):
+            return docs
+        # Trigrams can match out of order; keep true substrings only
+        found = np.fromiter((query in t for t in self.texts[docs]), dtype=bool, count=len(docs))
+        return docs[found]
+
+    def _fuzzy_word_docs(self, word):
+        """
+        Docs with a word close to `word`, and the best similarity in each.
+        """
+        grams = trigrams(f" {word} ")
+        hits = np.concatenate([self.word_postings(g) for g in grams])
+        words, shared = np.unique(hits, return_counts=True)
+        dice = 2 * shared / (len(grams) + self.word_grams[words])
+        words, dice = words[dice >= FUZZY_THRESHOLD], dice[dice >= FUZZY_THRESHOLD]
+
+        docs = self._docs_of_words(words)
+        dice = np.repeat(dice, self.word_offsets[words + 1] - self.word_offsets[words])
+        order = np.lexsort((-dice, docs))
+        docs, dice = docs[order], dice[order]
+        first = np.concatenate([[True], docs[1:] != docs[:-1]]) if len(docs) else docs.astype(bool)
+        return docs[first], dice[first]
+
+    def _fuzzy_docs(self, query):
+        """
+        Docs in which every word of `query` is close to some word (Dice
+        similarity of padded trigram sets), with the mean similarity.
+        """
+        words = query.split()
+        docs, similarity = self._fuzzy_word_docs(words[0])
+        for word in words[1:]:
+            other_docs, other_similarity = self._fuzzy_word_docs(word)
+            docs, mine, theirs = np.intersect1d(docs, other_docs, assume_unique=True, return_indices=True)
+            similarity = similarity[mine] + other_similarity[theirs]
+        return docs, similarity / len(words)
+
+    def _rank(self, query, docs, word_prefix=None):
+        # 0 exact, 1 name prefix, 2 word prefix, 3 substring;
+        # shorter names first within each
+        if not len(docs):
+            return docs
+        name_prefix = np.isin(docs, self._name_prefix_docs(query))
+        if word_prefix is None and " " in query:
+            word = f" {query}"
+            word_prefix = np.fromiter((word in t for t in self.texts[docs]), dtype=bool, count=len(docs))
+        elif word_prefix is None:
+            word_prefix = np.isin(docs, self._prefix_docs(query), assume_unique=True)
+        lengths = self.lengths[docs]
+        score = np.where(name_prefix, np.where(lengths == len(query), 0, 1), np.where(word_prefix, 2, 3))
+        return docs[np.argsort(score * (lengths.max() + 1) + lengths, kind="stable")]
+
+    def search(self, query, fuzzy=False, limit=None):
+        """
+        Ids whose name matches `query`, best match first: exact, then
+        name prefix, then word prefix, then substring. Queries under
+        three characters match word prefixes only. With `fuzzy`, names
+        with a close word (see FUZZY_THRESHOLD) for every query word
+        (typos, alternative spellings) follow the literal matches.
+        Returns:
+            numpy array of ids
+        """
+        query = fold(query)
+        if not query:
+            return self.ids[:0]
+
+        if len(query) < 3:
+            docs = self._rank(query, self._prefix_docs(query), word_prefix=True)
+        else:
+            docs = self._rank(query, self._substring_docs(query))
+
+        if fuzzy:
+            fuzzy_docs, similarity = self._fuzzy_docs(query)
+            extra = ~np.isin(fuzzy_docs, docs)
+            fuzzy_docs, similarity = fuzzy_docs[extra], similarity[extra]
+            order = np.lexsort((self.lengths[fuzzy_docs], -similarity))
+            docs = np.concatenate([docs, fuzzy_docs[order]])
+
+        if not len(docs):
+            return self.ids[:0]
+        rows = _gather(self.doc_rows, self.doc_offsets, docs.astype(np.int64))
+        codes = self.id_codes[rows]
+        _, first = np.unique(codes, return_index=True)
+        ids = self.ids[codes[np.sort(first)]]
+        return ids[:limit] if limit else ids
+
+    def memory_usage(self):
+        return (
+            sum(len(text) + 49 for text in self.texts)
+            + 8 * len(self.sorted_texts)
+            + sum(len(word) + 49 for word in self.words)
+            + sum(len(gram) + 100 for gram in self.gram_codes)
+            + sum(len(gram) + 100 for gram in self.word_gram_codes)
+            + sum(a.nbytes for a in (
+                self.id_codes, self.texts, self.lengths, self.sorted_docs, self.doc_rows, self.doc_offsets,
+                self.posting_docs, self.posting_offsets, self.word_docs,
+                self.word_offsets, self.word_posting_ids,
+                self.word_posting_offsets, self.word_grams,
+            ))
+        )
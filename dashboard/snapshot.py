@@ -0,0 +1,108 @@
+import os
+import time
+import uuid
+import shutil
+
+# pyarrow is only needed for the on-disk dashboard snapshot
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Shared by every dashboard replica on the host
+SNAPSHOT_DIR = os.getenv("DASHBOARD_SNAPSHOT_DIR", "data/snapshots")
+
+# Older versions are kept briefly so replicas mid-read are not disturbed
+KEEP_VERSIONS = int(os.getenv("DASHBOARD_SNAPSHOT_KEEP", "3"))
+
+CURRENT_FILE = "CURRENT"
+
+
+def available():
+    return pa is not None
+
+
+def current_version(snapshot_dir=SNAPSHOT_DIR):
+    """
+    Name of the snapshot the dashboard should read, or None.
+    """
+    try:
+        with open(os.path.join(snapshot_dir, CURRENT_FILE)) as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+
+    return version if os.path.isdir(os.path.join(snapshot_dir, version)) else None
+
+
+def write_snapshot(frames, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Write DataFrames as uncompressed Arrow IPC files (so they can be
+    memory-mapped) into a new version directory, then switch the CURRENT
+    pointer with an atomic rename. Readers see either the old or the new
+    snapshot, never a partial one.
+    Returns:
+        the new version name
+    """
+    if pa is None:
+        raise ImportError("Dashboard snapshots require pyarrow: pip install pyarrow")
+
+    version = time.strftime("v%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:8]
+    tmp_dir = os.path.join(snapshot_dir, f".tmp-{version}")
+    os.makedirs(tmp_dir)
+
+    for table, frame in frames.items():
+        arrow_table = pa.Table.from_pandas(frame, preserve_index=False)
+        with pa.OSFile(os.path.join(tmp_dir, f"{table}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+
+    os.rename(tmp_dir, os.path.join(snapshot_dir, version))
+
+    pointer = os.path.join(snapshot_dir, CURRENT_FILE + ".tmp")
+    with open(pointer, "w") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(snapshot_dir, CURRENT_FILE))
+
+    _prune(snapshot_dir, version)
+    return version
+
+
+def _prune(snapshot_dir, current):
+    versions = sorted(
+        name for name in os.listdir(snapshot_dir)
+        if name.startswith("v") and name != current
+    )
+    for name in versions[:max(0, len(versions) - (KEEP_VERSIONS - 1))]:
+        shutil.rmtree(os.path.join(snapshot_dir, name), ignore_errors=True)
+
+
+def read_snapshot(version, snapshot_dir=SNAPSHOT_DIR, tables=None):
+    """
+    Memory-map every table (or only `tables`) of a snapshot version
+    into DataFrames.
+    Returns:
+        frames: dict of table name -> DataFrame
+        timings: dict of table name -> seconds, plus "total"
+    """
+    if pa is None:
+        raise ImportError("Dashboard snapshots require pyarrow: pip install pyarrow")
+
+    start = time.perf_counter()
+    version_dir = os.path.join(snapshot_dir, version)
+    frames = {}
+    timings = {}
+
+    for name in sorted(os.listdir(version_dir)):
+        table_start = time.perf_counter()
+        table = name[:-len(".arrow")]
+        if tables is not None and table not in tables:
+            continue
+
+        with pa.memory_map(os.path.join(version_dir, name)) as source:
+            frames[table] = pa.ipc.open_file(source).read_all().to_pandas()
+
+        timings[table] = time.perf_counter() - table_start
+
+    timings["total"] = time.perf_counter() - start
+    return frames, timings
@@ -0,0 +1,140 @@
+import os
+import re
+import glob
+import time
+import sqlite3
+import threading
+import pandas as pd
+from collections import namedtuple
+from databases.sqlite_client import load_schema, mysql_to_sqlite
+from dashboard.loader import TABLE_SCHEMAS
+from dashboard.aggregates import latest_rankings
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), "..", "sql")
+
+# Per-query limits for the SQL Explorer
+QUERY_TIMEOUT = float(os.getenv("DASHBOARD_SQL_TIMEOUT", "5"))
+MAX_ROWS = int(os.getenv("DASHBOARD_SQL_MAX_ROWS", "10000"))
+
+# SQLite VM instructions between timeout checks
+PROGRESS_STEPS = 10000
+
+QueryResult = namedtuple("QueryResult", ["frame", "truncated", "seconds"])
+
+# Operations a read-only query may perform
+_ALLOWED = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    getattr(sqlite3, "SQLITE_RECURSIVE", 33),
+}
+
+
+def normalize_sql(sql):
+    """
+    Canonical form of a query for cache keys: comments removed,
+    whitespace collapsed, no trailing semicolon.
+    """
+    sql = re.sub(r"/\*.*?\*/", " ", sql, flags=re.S)
+    sql = re.sub(r"--[^\n]*", " ", sql)
+    return re.sub(r"\s+", " ", sql).strip().rstrip(";").strip()
+
+
+def load_queries(sql_dir=SQL_DIR):
+    """
+    The numbered analysis queries in sql/*.sql, i.e. every SELECT that
+    follows a "-- N. title" comment (schema and migration files have
+    none).
+    Returns:
+        list of (group, title, sql), in file order
+    """
+    queries = []
+
+    for path in sorted(glob.glob(os.path.join(sql_dir, "*.sql"))):
+        group = os.path.splitext(os.path.basename(path))[0]
+        with open(path) as f:
+            script = f.read()
+
+        for statement in script.split(";"):
+            titles = re.findall(r"^\s*--\s*(\d+\.\s*.+?)\s*$", statement, flags=re.M)
+            sql = normalize_sql(statement)
+            if titles and sql.upper().startswith("SELECT"):
+                body = re.sub(r"^\s*--[^\n]*\n", "", statement.strip() + "\n", flags=re.M)
+                queries.append((group, re.sub(r"\s+", " ", titles[-1]), body.strip()))
+
+    return queries
+
+
+class QueryEngine:
+    """
+    In-memory SQLite copy of the loaded dashboard tables, created from
+    sql/Tables.sql so the explorer queries run unchanged (MySQL
+    spellings are translated). Queries are read-only, single-statement,
+    time-limited and row-limited; one query runs at a time.
+    competitor_rankings holds the latest week of each ranking, as the
+    rest of the dashboard shows; the full weekly history is
+    competitor_rankings_history.
+    """
+
+    def __init__(self, frames):
+        self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self._lock = threading.Lock()
+
+        tables = dict(frames)
+        if "competitor_rankings" in frames:
+            tables["competitor_rankings"] = latest_rankings(frames["competitor_rankings"])
+            tables["competitor_rankings_history"] = frames["competitor_rankings"]
+
+        with self.connection:
+            for statement in load_schema():
+                self.connection.execute(statement)
+            for table in [*TABLE_SCHEMAS, "competitor_rankings_history"]:
+                if table in tables:
+                    tables[table].astype(object).where(tables[table].notna(), None).to_sql(
+                        table, self.connection, if_exists="append", index=False
+                    )
+
+    def _authorize(self, action, *args):
+        return sqlite3.SQLITE_OK if action in _ALLOWED else sqlite3.SQLITE_DENY
+
+    def execute(self, sql, max_rows=MAX_ROWS, timeout=QUERY_TIMEOUT):
+        """
+        Run one read-only query.
+        Returns:
+            QueryResult(frame, truncated, seconds); `truncated` is True
+            when more than `max_rows` rows matched
+        Raises:
+            TimeoutError when the query runs longer than `timeout`
+            sqlite3.Error for invalid or non read-only SQL
+        """
+        sql = mysql_to_sqlite(normalize_sql(sql))
+
+        with self._lock:
+            start = time.perf_counter()
+            deadline = start + timeout
+            self.connection.set_authorizer(self._authorize)
+            self.connection.set_progress_handler(
+                lambda: time.perf_counter() > deadline, PROGRESS_STEPS
+            )
+            try:
+                cursor = self.connection.execute(sql)
+                rows = cursor.fetchmany(max_rows + 1)
+                columns = [c[0] for c in cursor.description or []]
+                cursor.close()
+            except sqlite3.OperationalError as e:
+                if time.perf_counter() > deadline:
+                    raise TimeoutError(f"Query exceeded {timeout:g}s") from e
+                raise
+            finally:
+                self.connection.set_progress_handler(None, 0)
+                self.connection.set_authorizer(None)
+            seconds = time.perf_counter() - start
+
+        frame = pd.DataFrame(rows[:max_rows], columns=columns)
+        return QueryResult(frame, len(rows) > max_rows, seconds)
+
+    def memory_usage(self):
+        with self._lock:
+            pages = self.connection.execute("PRAGMA page_count").fetchone()[0]
+            size = self.connection.execute("PRAGMA page_size").fetchone()[0]
+        return pages * size
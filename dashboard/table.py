@@ -0,0 +1,78 @@
+import os
+import math
+import numpy as np
+import pandas as pd
+import streamlit as st
+from dashboard import memo
+
+# Rows sent to the browser per table page
+TABLE_PAGE_SIZE = int(os.getenv("DASHBOARD_TABLE_PAGE_SIZE", "100"))
+
+DEFAULT_ORDER = "(default order)"
+
+
+def row_order(frame, sort=None, ascending=True, search="", order=None):
+    """
+    Positions of the rows of `frame` containing `search` (literal,
+    case-insensitive, in any text column), sorted by `sort` or else by
+    `order`, a list of (column, ascending) pairs.
+    """
+    positions = np.arange(len(frame))
+
+    if search:
+        text_columns = [c for c in frame.columns if not pd.api.types.is_numeric_dtype(frame[c])]
+        matches = np.zeros(len(frame), dtype=bool)
+        for column in text_columns:
+            matches |= frame[column].astype("string").str.contains(
+                search, case=False, regex=False, na=False
+            ).to_numpy(dtype=bool)
+        positions = positions[matches]
+
+    if sort:
+        by, ascending = [sort], [ascending]
+    elif order:
+        by, ascending = [c for c, _ in order], [a for _, a in order]
+    else:
+        return positions
+
+    subset = frame.iloc[positions].reset_index(drop=True)
+    sorted_index = subset.sort_values(by, ascending=ascending, kind="stable").index
+    return positions[sorted_index.to_numpy()]
+
+
+def paged_table(frame, key, cache_key=None, order=None, page_size=TABLE_PAGE_SIZE):
+    """
+    Table that searches, sorts and pages on the server and sends only
+    the visible page to the browser, with the total row count.
+    `key` namespaces the widgets; with a `cache_key` (data version,
+    filters, ...) the sorted row order is memoised across reruns.
+    """
+    c1, c2, c3 = st.columns([2, 2, 1])
+    search = c1.text_input("🔎 Filter rows", key=f"{key}_search", placeholder="contains…").strip()
+    sort = c2.selectbox("Sort by", [DEFAULT_ORDER] + list(frame.columns), key=f"{key}_sort")
+    ascending = c3.toggle("Ascending", value=True, key=f"{key}_ascending")
+    sort = None if sort == DEFAULT_ORDER else sort
+
+    def compute():
+        return row_order(frame, sort, ascending, search, order)
+
+    if cache_key is None:
+        positions = compute()
+    else:
+        positions = memo.memoize(("table", key, cache_key, sort, ascending, search.lower()), compute)
+
+    pages = max(1, math.ceil(len(positions) / page_size))
+    page = 1
+    if pages > 1:
+        # Keyed on the page count, so a new filter starts at page 1
+        page = st.number_input(
+            f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"{key}_page_{pages}"
+        )
+
+    start = (page - 1) * page_size
+    window = frame.iloc[positions[start:start + page_size]]
+    st.dataframe(window.reset_index(drop=True), use_container_width=True)
+
+    end = start + len(window)
+    shown = f"rows {start + 1:,}–{end:,}" if len(window) else "no rows"
+    st.caption(f"{shown} of {len(positions):,}" + (f" (filtered from {len(frame):,})" if search else ""))
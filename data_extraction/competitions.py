@@ -1,6 +1,6 @@
 import os
-import requests
 from dotenv import load_dotenv
+from data_extraction import response_cache
 
 # Load environment variables from .env
 load_dotenv()
@@ -11,14 +11,26 @@ API_KEY = os.getenv("SPORTSRADAR_API_KEY")
 if not API_KEY:
     raise ValueError("SPORTSRADAR_API_KEY is not set in the environment")
 
-URL = "https://api.sportradar.com/tennis/trial/v3/en/competitions.json"
+# Base URL can be pointed at a local stub server for testing
+BASE_URL = os.getenv(
+    "SPORTSRADAR_BASE_URL", "https://api.sportradar.com/tennis/trial/v3/en"
+)
+URL = f"{BASE_URL}/competitions.json"
 
 
 def fetch_competitions():
-    response = requests.get(URL, params={"api_key": API_KEY})
+    # None means the cached payload is still current (fresh or 304)
+    response = response_cache.conditional_get(
+        URL, params={"api_key": API_KEY}, tables=("categories", "competitions")
+    )
+    if response is None:
+        return None
+
     response.raise_for_status()
-    data = response.json()
+    return parse_competitions(response.json())
+
 
+def parse_competitions(data):
     categories_dict = {}
     competitions = []
 
@@ -47,6 +59,10 @@ def fetch_competitions():
 
 
 if __name__ == "__main__":
-    categories, competitions = fetch_competitions()
+    result = fetch_competitions()
+    if result is None:
+        raise SystemExit("Competitions unchanged since last fetch (cached)")
+
+    categories, competitions = result
     print(f"Fetched {len(categories)} categories")
     print(f"Fetched {len(competitions)} competitions")
@@ -1,6 +1,6 @@
 import os
-import requests
 from dotenv import load_dotenv
+from data_extraction import response_cache
 
 # Load environment variables
 load_dotenv()
@@ -10,18 +10,34 @@ API_KEY = os.getenv("SPORTSRADAR_API_KEY")
 if not API_KEY:
     raise ValueError("SPORTSRADAR_API_KEY is not set in the environment")
 
-URL = "https://api.sportradar.com/tennis/trial/v3/en/complexes.json"
+# Base URL can be pointed at a local stub server for testing
+BASE_URL = os.getenv(
+    "SPORTSRADAR_BASE_URL", "https://api.sportradar.com/tennis/trial/v3/en"
+)
+URL = f"{BASE_URL}/complexes.json"
 
 
 def fetch_complexes():
-    response = requests.get(URL, params={"api_key": API_KEY}, timeout=10)
+    # None means the cached payload is still current (fresh or 304)
+    response = response_cache.conditional_get(
+        URL, params={"api_key": API_KEY}, tables=("complexes", "venues")
+    )
+    if response is None:
+        return None
+
+    # 429 and 5xx are only left once the client's retries are spent:
+    # fail the step rather than load nothing, so its loads are skipped
+    if response.status_code == 429 or response.status_code >= 500:
+        response.raise_for_status()
 
     if response.status_code != 200:
         print("Access denied:", response.text)
         return [], []
 
-    data = response.json()
+    return parse_complexes(response.json())
+
 
+def parse_complexes(data):
     if "complexes" not in data:
         print("Unexpected format:", data)
         return [], []
@@ -50,6 +66,10 @@ def fetch_complexes():
 
 
 if __name__ == "__main__":
-    complexes, venues = fetch_complexes()
+    result = fetch_complexes()
+    if result is None:
+        raise SystemExit("Complexes unchanged since last fetch (cached)")
+
+    complexes, venues = result
     print(f"Fetched {len(complexes)} complexes")
     print(f"Fetched {len(venues)} venues")
@@ -0,0 +1,171 @@
+import os
+import time
+import random
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+
+# Number of keep-alive connections kept open per host
+POOL_SIZE = int(os.getenv("SPORTSRADAR_POOL_SIZE", "10"))
+
+DEFAULT_TIMEOUT = 10
+
+# Client-side throttle shared by every extractor (trial keys allow ~1 QPS)
+RATE_LIMIT_QPS = float(os.getenv("SPORTSRADAR_QPS", "1"))
+RATE_LIMIT_BURST = int(os.getenv("SPORTSRADAR_BURST", "1"))
+
+# Retry policy for throttled (429) and server-side (5xx) failures
+MAX_RETRIES = int(os.getenv("SPORTSRADAR_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("SPORTSRADAR_BACKOFF_BASE", "1.0"))
+BACKOFF_MAX = float(os.getenv("SPORTSRADAR_BACKOFF_MAX", "30"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0,
+    "retried": 0,
+    "throttled": 0,
+    "wait_seconds": 0.0,
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, at most
+    `burst` tokens banked. acquire() blocks until a token is free.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take one token, sleeping if needed. Returns seconds waited.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # Reserve the token now; callers that go negative wait their turn
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+rate_limiter = TokenBucket(RATE_LIMIT_QPS, RATE_LIMIT_BURST)
+
+
+def create_session(pool_size=POOL_SIZE):
+    """
+    Build a requests.Session with a connection pool sized for
+    concurrent extractors. Connections are kept alive and reused
+    across calls, and gzip responses are accepted.
+    """
+    session = requests.Session()
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    session.headers.update({
+        "accept": "application/json",
+        "accept-encoding": "gzip, deflate",
+    })
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide session shared by all extractors.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+    return _session
+
+
+def _record(**increments):
+    with _stats_lock:
+        for name, value in increments.items():
+            _stats[name] += value
+
+
+def get_stats():
+    """
+    Snapshot of the request counters: requests issued, retried,
+    throttled (429 responses) and total seconds spent waiting on the
+    rate limiter or backing off.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _retry_after(response):
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date) into seconds.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt):
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def get(url, **kwargs):
+    """
+    Rate-limited GET through the shared session.
+    429 and 5xx responses, timeouts and connection errors are retried
+    with exponential backoff, honouring Retry-After when the API sends
+    it. The last response (or exception) is returned to the caller.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+    for attempt in range(MAX_RETRIES + 1):
+        _record(wait_seconds=rate_limiter.acquire(), requests=1)
+
+        try:
+            response = get_session().get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            delay = _backoff(attempt)
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+
+            if response.status_code == 429:
+                _record(throttled=1)
+
+            delay = _retry_after(response)
+            if delay is None:
+                delay = _backoff(attempt)
+
+            # Hand the connection back to the pool (matters with stream=True)
+            response.close()
+
+        _record(retried=1, wait_seconds=delay)
+        time.sleep(delay)
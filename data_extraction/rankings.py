@@ -1,6 +1,13 @@
 import os
-import requests
+from datetime import date, timedelta
 from dotenv import load_dotenv
+from data_extraction import http_client, response_cache
+
+# ijson is only needed for the streaming mode (stream_rankings)
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 # Load environment variables
 load_dotenv()
@@ -10,13 +17,23 @@ API_KEY = os.getenv("SPORTSRADAR_API_KEY")
 if not API_KEY:
     raise ValueError("SPORTSRADAR_API_KEY is not set in the environment")
 
-URL = "https://api.sportradar.com/tennis/trial/v3/en/double_competitors_rankings.json"
+# Base URL can be pointed at a local stub server for testing
+BASE_URL = os.getenv(
+    "SPORTSRADAR_BASE_URL", "https://api.sportradar.com/tennis/trial/v3/en"
+)
+URL = f"{BASE_URL}/double_competitors_rankings.json"
 
 HEADERS = {
     "accept": "application/json",
     "x-api-key": API_KEY
 }
 
+# Rows per chunk yielded by stream_rankings()
+STREAM_CHUNK_SIZE = int(os.getenv("SPORTSRADAR_STREAM_CHUNK_SIZE", "1000"))
+
+# ijson prefix of a single entry in rankings[].competitor_rankings[]
+_ROW_PREFIX = "rankings.item.competitor_rankings.item"
+
 
 def fetch_rankings():
     """
@@ -25,59 +42,167 @@ def fetch_rankings():
     Returns:
         competitors: list of competitor dicts
         rankings: list of ranking dicts
+        or None when the rankings have not changed since the last fetch.
+    Raises:
+        requests.RequestException when the API is still unreachable,
+        throttling (429) or failing (5xx) after the client's retries
     """
-    try:
-        response = requests.get(URL, headers=HEADERS, timeout=10)
+    response = response_cache.conditional_get(
+        URL, headers=HEADERS, tables=("competitors", "competitor_rankings")
+    )
 
-        if response.status_code == 403:
-            print("Error 403: Forbidden. Check your API key or endpoint.")
-            return [], []
+    # Cached payload is still current (fresh or 304)
+    if response is None:
+        return None
 
-        if response.status_code == 404:
-            print("Error 404: Not Found. Endpoint may not exist for your key.")
-            return [], []
-
-        response.raise_for_status()
-        data = response.json()
+    if response.status_code == 403:
+        print("Error 403: Forbidden. Check your API key or endpoint.")
+        return [], []
 
-    except requests.RequestException as e:
-        print("Request failed:", e)
+    if response.status_code == 404:
+        print("Error 404: Not Found. Endpoint may not exist for your key.")
         return [], []
 
+    # Fail the step rather than load nothing, so its loads are skipped
+    response.raise_for_status()
+    return parse_rankings(response.json())
+
+
+def parse_rankings(data):
+    """
+    Flatten a rankings payload into competitor and ranking rows.
+    """
     competitors = []
     rankings = []
 
     # Loop through all returned rankings
     for ranking in data.get("rankings", []):
-        ranking_id = ranking.get("id", "")
-        ranking_name = ranking.get("name", "")
+        header = _ranking_header(ranking)
 
         for r in ranking.get("competitor_rankings", []):
-            comp = r.get("competitor", {})
-
-            competitors.append({
-                "competitor_id": comp.get("id"),
-                "name": comp.get("name"),
-                "country": comp.get("country"),
-                "country_code": comp.get("country_code"),
-                "abbreviation": comp.get("abbreviation")
-            })
-
-            rankings.append({
-                "ranking_id": ranking_id,
-                "ranking_name": ranking_name,
-                "rank": r.get("rank"),
-                "movement": r.get("movement"),
-                "points": r.get("points"),
-                "competitions_played": r.get("competitions_played"),
-                "competitor_id": comp.get("id")
-            })
+            competitor, row = _build_rows(header, r)
+            competitors.append(competitor)
+            rankings.append(row)
 
     return competitors, rankings
 
 
+def snapshot_date(year=None, week=None):
+    """
+    Monday of the ranking week (ISO date string).
+    Falls back to the current week when the payload has no year/week.
+    """
+    if year and week:
+        return date.fromisocalendar(int(year), int(week), 1).isoformat()
+
+    today = date.today()
+    return (today - timedelta(days=today.weekday())).isoformat()
+
+
+def _ranking_header(ranking):
+    return {
+        "ranking_id": str(ranking.get("id", ranking.get("type_id", ""))),
+        "ranking_name": ranking.get("name", ""),
+        "snapshot_date": snapshot_date(ranking.get("year"), ranking.get("week")),
+    }
+
+
+def _build_rows(header, r):
+    comp = r.get("competitor", {})
+
+    competitor = {
+        "competitor_id": comp.get("id"),
+        "name": comp.get("name"),
+        "country": comp.get("country"),
+        "country_code": comp.get("country_code"),
+        "abbreviation": comp.get("abbreviation")
+    }
+
+    ranking = {
+        **header,
+        "rank": r.get("rank"),
+        "movement": r.get("movement"),
+        "points": r.get("points"),
+        "competitions_played": r.get("competitions_played"),
+        "competitor_id": comp.get("id")
+    }
+
+    return competitor, ranking
+
+
+def iter_ranking_rows(stream):
+    """
+    Incrementally parse rankings[].competitor_rankings[] from a file-like
+    byte stream, yielding one (competitor, ranking) pair at a time.
+    Only the entry currently being parsed is held in memory.
+    Ranking-level fields (id, name, year, week) are picked up as they
+    appear, so they must precede "competitor_rankings" in each ranking
+    object (as they do in SportRadar payloads).
+    """
+    if ijson is None:
+        raise ImportError("Streaming mode requires ijson: pip install ijson")
+
+    ranking = {}
+    header = None
+    builder = None
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == _ROW_PREFIX and event == "end_map":
+                yield _build_rows(header, builder.value)
+                builder = None
+
+        elif prefix == _ROW_PREFIX and event == "start_map":
+            if header is None:
+                header = _ranking_header(ranking)
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+
+        elif prefix == "rankings.item" and event == "start_map":
+            ranking = {}
+            header = None
+        elif prefix.startswith("rankings.item.") and prefix.count(".") == 2 and event in ("string", "number"):
+            ranking[prefix.rsplit(".", 1)[1]] = value
+
+
+def stream_rankings(chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Streaming variant of fetch_rankings() for large payloads.
+    The response body is parsed as it arrives and yielded in chunks of
+    at most `chunk_size` rows, so peak memory is bounded by one chunk
+    rather than the whole payload. Bypasses the response cache.
+    Yields:
+        (competitors, rankings) lists for each chunk
+    """
+    response = http_client.get(URL, headers=HEADERS, stream=True)
+
+    with response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+
+        competitors = []
+        rankings = []
+
+        for competitor, ranking in iter_ranking_rows(response.raw):
+            competitors.append(competitor)
+            rankings.append(ranking)
+
+            if len(rankings) >= chunk_size:
+                yield competitors, rankings
+                competitors = []
+                rankings = []
+
+        if rankings:
+            yield competitors, rankings
+
+
 if __name__ == "__main__":
-    competitors, rankings = fetch_rankings()
+    result = fetch_rankings()
+    if result is None:
+        raise SystemExit("Rankings unchanged since last fetch (cached)")
+
+    competitors, rankings = result
     print(f"Fetched {len(competitors)} competitors")
     print(f"Fetched {len(rankings)} rankings")
 
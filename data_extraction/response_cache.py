@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from data_extraction import http_client
+from databases import fingerprints
+
+# Where cached response bodies and the index live: one cache per target
+# database (keyed like its fingerprints), so a payload only counts as
+# unchanged for the database it was loaded into
+CACHE_DIR = os.path.join(
+    os.getenv("SPORTSRADAR_CACHE_DIR", ".cache/sportradar"),
+    hashlib.sha1(os.path.abspath(fingerprints.FINGERPRINT_DB).encode()).hexdigest()[:12],
+)
+
+# Set SPORTSRADAR_CACHE=0 to always download and reload everything
+CACHE_ENABLED = os.getenv("SPORTSRADAR_CACHE", "1") != "0"
+
+MAX_ENTRIES = int(os.getenv("SPORTSRADAR_CACHE_MAX_ENTRIES", "50"))
+MAX_BYTES = int(os.getenv("SPORTSRADAR_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# Seconds a cached response is trusted without contacting the API.
+# After that a conditional request (ETag / If-Modified-Since) is sent.
+DEFAULT_TTL = 0
+ENDPOINT_TTLS = {
+    "competitions.json": 24 * 3600,
+    "complexes.json": 24 * 3600,
+    "double_competitors_rankings.json": 0,
+}
+
+
+class ResponseCache:
+    """
+    On-disk cache of raw API responses keyed by URL + params.
+    Each entry keeps the body together with its ETag / Last-Modified
+    headers. Size is bounded by entry count and total bytes, evicting
+    the least recently used entry first.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._staged = {}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    @staticmethod
+    def make_key(url, params=None):
+        raw = json.dumps([url, sorted((params or {}).items())])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, key + ".body")
+
+    def get(self, key):
+        """
+        Return the index entry for `key` (marking it recently used), or None.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or not os.path.exists(self._body_path(key)):
+                return None
+            entry["last_used"] = time.time()
+            self._save_index()
+            return dict(entry)
+
+    def read_body(self, key):
+        with open(self._body_path(key), "rb") as f:
+            return f.read()
+
+    def put(self, key, url, body, etag=None, last_modified=None):
+        with self._lock:
+            tmp_path = self._body_path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, self._body_path(key))
+
+            now = time.time()
+            self._index[key] = {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "size": len(body),
+                "stored_at": now,
+                "last_used": now,
+            }
+            self._evict()
+            self._save_index()
+
+    def stage(self, key, url, body, etag=None, last_modified=None):
+        """
+        Hold a downloaded response until commit(url), so it only becomes
+        the cached copy once the data it carries has been loaded.
+        """
+        with self._lock:
+            self._staged[key] = (url, body, etag, last_modified)
+
+    def commit(self, url):
+        with self._lock:
+            keys = [key for key, staged in self._staged.items() if staged[0] == url]
+            staged = [(key, self._staged.pop(key)) for key in keys]
+
+        for key, (url, body, etag, last_modified) in staged:
+            self.put(key, url, body, etag=etag, last_modified=last_modified)
+
+    def touch(self, key):
+        """
+        Reset the freshness clock after a successful revalidation (304).
+        """
+        with self._lock:
+            if key in self._index:
+                self._index[key]["stored_at"] = time.time()
+                self._save_index()
+
+    def _evict(self):
+        total = sum(e["size"] for e in self._index.values())
+
+        # Oldest last_used first
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_used"]):
+            if len(self._index) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+    return _cache
+
+
+def endpoint_ttl(url):
+    return ENDPOINT_TTLS.get(url.rsplit("/", 1)[-1], DEFAULT_TTL)
+
+
+def commit(url):
+    """
+    Cache the responses fetched from `url` in this run. Call it once
+    every table loaded from them is stored: until then a failed load is
+    downloaded and loaded again on the next run.
+    """
+    if CACHE_ENABLED:
+        get_cache().commit(url)
+
+
+def conditional_get(url, params=None, headers=None, ttl=None, tables=()):
+    """
+    GET `url` through the response cache.
+    A new 200 response is only staged; see commit(). The cached copy is
+    ignored when LOAD_FULL_REFRESH is set or any of the `tables` loaded
+    from it has no rows recorded in the target database.
+    Returns:
+        None if the cached copy is still valid (fresh within its TTL or
+        the API answered 304 Not Modified), so the caller can skip
+        parsing and loading entirely; otherwise the requests.Response.
+    """
+    if not CACHE_ENABLED:
+        return http_client.get(url, params=params, headers=headers)
+
+    cache = get_cache()
+    key = cache.make_key(url, params)
+    entry = cache.get(key)
+    if entry and fingerprints.needs_reload(tables):
+        entry = None
+    ttl = endpoint_ttl(url) if ttl is None else ttl
+
+    if entry and time.time() - entry["stored_at"] < ttl:
+        return None
+
+    request_headers = dict(headers or {})
+    if entry and entry.get("etag"):
+        request_headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        request_headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = http_client.get(url, params=params, headers=request_headers)
+
+    if response.status_code == 304 and entry:
+        cache.touch(key)
+        return None
+
+    if response.status_code == 200:
+        cache.stage(
+            key,
+            url,
+            response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    return response
@@ -0,0 +1,38 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# "supabase" (remote, default) or "sqlite" (embedded, fully offline)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+
+_client = None
+
+
+def get_client(backend=None):
+    """
+    Return the storage client for the configured backend.
+    Both backends expose the same table(...).select/insert/upsert(...)
+    .execute() interface, so the loader and dashboard don't care which
+    one they talk to. The Supabase module is only imported (and its
+    credentials only required) when that backend is selected.
+    """
+    global _client
+    backend = (backend or STORAGE_BACKEND).lower()
+
+    if _client is not None and backend == STORAGE_BACKEND:
+        return _client
+
+    if backend == "supabase":
+        from databases.supabase_client import supabase
+        client = supabase
+    elif backend == "sqlite":
+        from databases.sqlite_client import LocalClient
+        client = LocalClient()
+    else:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+    if backend == STORAGE_BACKEND:
+        _client = client
+    return client
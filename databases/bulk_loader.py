@@ -0,0 +1,118 @@
+import os
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Rows per request and number of requests in flight per table
+BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", "500"))
+WORKERS = int(os.getenv("LOAD_WORKERS", "4"))
+
+# Attempts per batch before the whole load fails
+MAX_RETRIES = int(os.getenv("LOAD_MAX_RETRIES", "3"))
+RETRY_BACKOFF = 0.5
+
+
+def batched(rows, size):
+    """
+    Split any iterable (list or generator) into lists of at most `size`.
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def key_columns(key):
+    """
+    Normalise a conflict key (column name or tuple of names) to a tuple.
+    """
+    return (key,) if isinstance(key, str) else tuple(key)
+
+
+def key_of(row, key):
+    return tuple(row[column] for column in key_columns(key))
+
+
+def _dedupe(batch, key):
+    # Postgres rejects an upsert that touches the same key twice,
+    # so keep only the last row for each key within a batch
+    return list({key_of(row, key): row for row in batch}.values())
+
+
+def _send(client, table, batch, mode, key, max_retries):
+    """
+    Write one batch, retrying with backoff. Returns the number of retries.
+    """
+    # max_retries counts attempts; there is always at least one
+    attempts = max(max_retries, 1)
+    for attempt in range(attempts):
+        try:
+            query = client.table(table)
+            if mode == "upsert" and key:
+                query = query.upsert(batch, on_conflict=",".join(key_columns(key)))
+            elif mode == "upsert":
+                query = query.upsert(batch)
+            else:
+                query = query.insert(batch)
+            query.execute()
+            return attempt
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            print(f"⚠️ {table}: batch of {len(batch)} failed ({e}), retrying")
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+def bulk_load(
+    client,
+    table,
+    rows,
+    key=None,
+    mode="upsert",
+    batch_size=BATCH_SIZE,
+    workers=WORKERS,
+    max_retries=MAX_RETRIES,
+):
+    """
+    Load `rows` into `table` in batches sent concurrently by a worker pool.
+    `client` is any supabase/postgrest client; `key` is the conflict
+    column (or tuple of columns) for upserts. At most 2 * workers batches are buffered, so
+    `rows` can be a generator of arbitrary size.
+    Returns:
+        summary dict with rows, batches, retries, seconds and rows_per_sec
+    """
+    start = time.perf_counter()
+    summary = {"table": table, "rows": 0, "batches": 0, "retries": 0}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        for batch in batched(rows, batch_size):
+            if mode == "upsert" and key:
+                batch = _dedupe(batch, key)
+
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    summary["retries"] += future.result()
+
+            pending.add(pool.submit(_send, client, table, batch, mode, key, max_retries))
+            summary["rows"] += len(batch)
+            summary["batches"] += 1
+
+        for future in pending:
+            summary["retries"] += future.result()
+
+    summary["seconds"] = time.perf_counter() - start
+    summary["rows_per_sec"] = summary["rows"] / summary["seconds"] if summary["seconds"] else 0.0
+    return summary
+
+
+def format_summary(summary):
+    return (
+        f"✅ {summary['table']}: {summary['rows']} rows in "
+        f"{summary['batches']} batches, {summary['seconds']:.2f}s "
+        f"({summary['rows_per_sec']:.0f} rows/s, {summary['retries']} retries)"
+    )
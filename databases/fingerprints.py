@@ -0,0 +1,147 @@
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from databases.backend import STORAGE_BACKEND
+from databases.bulk_loader import key_of
+
+
+def default_path():
+    """
+    Where the hashes of a target database live: inside the SQLite file
+    itself, so a new or deleted database starts with none, or in a
+    local file per Supabase project.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        from databases.sqlite_client import LOCAL_DB_PATH
+        return LOCAL_DB_PATH
+
+    project = hashlib.sha1(os.getenv("SUPABASE_URL", "").encode()).hexdigest()[:12]
+    return f".cache/fingerprints-{STORAGE_BACKEND}-{project}.sqlite"
+
+
+# Per-row content hashes from previous successful loads into the
+# current target database (LOAD_FINGERPRINT_DB overrides the location)
+FINGERPRINT_DB = os.getenv("LOAD_FINGERPRINT_DB") or default_path()
+
+# Set LOAD_FULL_REFRESH=1 to resend every row (e.g. after the remote
+# tables were wiped); fingerprints are still refreshed afterwards
+FULL_REFRESH = os.getenv("LOAD_FULL_REFRESH") == "1"
+
+
+def row_hash(row):
+    raw = json.dumps(row, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class FingerprintStore:
+    """
+    SQLite-backed map of (table, primary key) -> row hash.
+    Each table's hashes are read once and kept in memory.
+    """
+
+    def __init__(self, path=FINGERPRINT_DB):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # May share the file with the SQLite backend's own writers
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._tables = {}
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS load_fingerprints ("
+                " table_name TEXT, pk TEXT, hash TEXT,"
+                " PRIMARY KEY (table_name, pk))"
+            )
+
+    def load(self, table):
+        with self._lock:
+            if table not in self._tables:
+                rows = self._conn.execute(
+                    "SELECT pk, hash FROM load_fingerprints WHERE table_name = ?",
+                    (table,),
+                )
+                self._tables[table] = dict(rows)
+            return self._tables[table]
+
+    def save(self, table, hashes):
+        if not hashes:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO load_fingerprints VALUES (?, ?, ?)",
+                [(table, pk, h) for pk, h in hashes.items()],
+            )
+            self._tables.setdefault(table, {}).update(hashes)
+
+
+class ChangeSet:
+    """
+    Filters a row stream down to new or changed rows for one table load.
+    Hashes are only written to the store by commit(), so a failed load
+    is retried in full on the next run.
+    """
+
+    def __init__(self, store, table, key):
+        self.store = store
+        self.table = table
+        self.key = key
+        self.known = {} if FULL_REFRESH else store.load(table)
+        self.pending = {}
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0}
+
+    def filter(self, rows):
+        for row in rows:
+            values = key_of(row, self.key)
+            pk = str(values[0]) if len(values) == 1 else json.dumps(values, default=str)
+            h = row_hash(row)
+            old = self.pending.get(pk, self.known.get(pk))
+
+            if old == h:
+                self.counts["unchanged"] += 1
+                continue
+
+            self.counts["new" if old is None else "changed"] += 1
+            self.pending[pk] = h
+            yield row
+
+    def commit(self):
+        self.store.save(self.table, self.pending)
+        self.pending = {}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FingerprintStore()
+    return _store
+
+
+def needs_reload(tables):
+    """
+    True when every row must be loaded again: a full refresh was asked
+    for, or one of `tables` has no hashes in the target database yet.
+    """
+    if FULL_REFRESH:
+        return True
+    store = get_store()
+    return any(not store.load(table) for table in tables)
+
+
+def changes(table, key):
+    return ChangeSet(get_store(), table, key)
+
+
+def format_counts(table, counts):
+    return (
+        f"🔎 {table}: {counts['new']} new, {counts['changed']} changed, "
+        f"{counts['unchanged']} unchanged"
+    )
@@ -0,0 +1,113 @@
+import os
+import glob
+import uuid
+import threading
+import pandas as pd
+
+# pyarrow is only needed for the local history store
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Parquet dataset partitioned by snapshot_date=YYYY-MM-DD
+HISTORY_DIR = os.getenv("RANKINGS_HISTORY_DIR", "data/rankings_history")
+
+SCHEMA_COLUMNS = [
+    ("ranking_id", "string"),
+    ("ranking_name", "string"),
+    ("snapshot_date", "string"),
+    ("competitor_id", "string"),
+    ("rank", "int32"),
+    ("movement", "int32"),
+    ("points", "int32"),
+    ("competitions_played", "int32"),
+]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The rankings history store requires pyarrow: pip install pyarrow")
+
+
+def _schema():
+    return pa.schema([(name, getattr(pa, dtype)()) for name, dtype in SCHEMA_COLUMNS])
+
+
+class SnapshotWriter:
+    """
+    Writes weekly ranking snapshots into the Parquet history store.
+    The first write to a snapshot_date partition during a run replaces
+    whatever an earlier run left there, so re-running the same week is
+    idempotent even when rows arrive in several chunks.
+    """
+
+    def __init__(self, history_dir=HISTORY_DIR):
+        _require_pyarrow()
+        self.history_dir = history_dir
+        self._replaced = set()
+        self._lock = threading.Lock()
+
+    def write(self, rankings):
+        frame = pd.DataFrame(rankings, columns=[name for name, _ in SCHEMA_COLUMNS])
+        if frame.empty:
+            return
+
+        for day, part in frame.groupby("snapshot_date"):
+            partition = os.path.join(self.history_dir, f"snapshot_date={day}")
+
+            with self._lock:
+                if day not in self._replaced:
+                    for old in glob.glob(os.path.join(partition, "*.parquet")):
+                        os.remove(old)
+                    self._replaced.add(day)
+                os.makedirs(partition, exist_ok=True)
+
+            table = pa.Table.from_pandas(part, schema=_schema(), preserve_index=False)
+            pq.write_table(
+                table.drop_columns(["snapshot_date"]),
+                os.path.join(partition, f"part-{uuid.uuid4().hex}.parquet"),
+                compression="zstd",
+            )
+
+
+def load_history(competitor_ids=None, ranking_id=None, since=None, columns=None, history_dir=HISTORY_DIR):
+    """
+    Read ranking snapshots as a DataFrame.
+    Filters are pushed down to the Parquet scan, and `since` prunes
+    whole snapshot_date partitions, so trend queries over years of
+    history only read the columns and weeks they need.
+    """
+    _require_pyarrow()
+    if not os.path.isdir(history_dir):
+        return pd.DataFrame(columns=[name for name, _ in SCHEMA_COLUMNS])
+
+    partitioning = ds.partitioning(pa.schema([("snapshot_date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(history_dir, format="parquet", partitioning=partitioning)
+
+    condition = None
+    for expr in [
+        ds.field("competitor_id").isin(list(competitor_ids)) if competitor_ids else None,
+        ds.field("ranking_id") == str(ranking_id) if ranking_id is not None else None,
+        ds.field("snapshot_date") >= str(since) if since else None,
+    ]:
+        if expr is not None:
+            condition = expr if condition is None else condition & expr
+
+    frame = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    order = [c for c in ("snapshot_date", "rank") if c in frame.columns]
+    return frame.sort_values(order).reset_index(drop=True)
+
+
+def rank_trend(competitor_id, since=None, history_dir=HISTORY_DIR):
+    """
+    Week-by-week rank and points for one competitor.
+    """
+    return load_history(
+        competitor_ids=[competitor_id],
+        since=since,
+        columns=["snapshot_date", "ranking_id", "rank", "points", "movement"],
+        history_dir=history_dir,
+    )
@@ -0,0 +1,184 @@
+import os
+import re
+import sqlite3
+import threading
+
+# Embedded database file used when STORAGE_BACKEND=sqlite
+LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH", "data/tennis.sqlite")
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "sql", "Tables.sql")
+
+
+def mysql_to_sqlite(sql):
+    """
+    Translate the MySQL dialect used under sql/ to SQLite.
+    `rank1` is how Tables.sql spells the rank column (RANK is reserved
+    in MySQL 8); the loader and dashboard use `rank`, as Supabase does.
+    """
+    sql = re.sub(r"\brank1\b", "rank", sql)
+    sql = re.sub(r"\bINT AUTO_INCREMENT PRIMARY KEY\b", "INTEGER PRIMARY KEY AUTOINCREMENT", sql, flags=re.I)
+    sql = re.sub(r"\bUNIQUE KEY \w+ \(", "UNIQUE (", sql, flags=re.I)
+    return sql
+
+
+def load_schema(path=SCHEMA_PATH):
+    """
+    CREATE TABLE / CREATE INDEX statements from Tables.sql, in SQLite form.
+    Inline MySQL `INDEX name (cols)` clauses become CREATE INDEX statements.
+    """
+    with open(path) as f:
+        script = re.sub(r"--[^\n]*", "", f.read())
+
+    statements = []
+    for statement in script.split(";"):
+        statement = statement.strip()
+        match = re.match(r"CREATE TABLE (\w+)", statement, flags=re.I)
+        if not match:
+            continue
+
+        table = match.group(1).lower()
+        indexes = re.findall(r",\s*INDEX (\w+) \(([^)]*)\)", statement, flags=re.I)
+        statement = re.sub(r",\s*INDEX \w+ \([^)]*\)", "", statement, flags=re.I)
+
+        statements.append(mysql_to_sqlite(statement).replace(match.group(1), table, 1))
+        for name, columns in indexes:
+            statements.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+    return [s.replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1) for s in statements]
+
+
+class APIResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class LocalQuery:
+    """
+    The subset of the postgrest query builder used by this project,
+    executed against SQLite.
+    """
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.columns = "*"
+        self.count = None
+        self.order_by = []
+        self.limit = None
+        self.offset = 0
+        self.rows = []
+        self.on_conflict = None
+
+    def select(self, *columns, count=None):
+        self.operation = "select"
+        self.columns = ",".join(columns) or "*"
+        self.count = count
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by.append(f"{column} DESC" if desc else column)
+        return self
+
+    def range(self, start, end):
+        # Inclusive bounds, like PostgREST's Range header
+        self.offset = start
+        self.limit = end - start + 1
+        return self
+
+    def insert(self, rows):
+        self.operation = "insert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.operation = "upsert"
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        return self
+
+    def execute(self):
+        if self.operation == "select":
+            return self._select()
+        return self._write()
+
+    def _select(self):
+        connection = self.client.connection()
+
+        sql = f"SELECT {self.columns} FROM {self.table}"
+        if self.order_by:
+            sql += " ORDER BY " + ", ".join(self.order_by)
+        if self.limit is not None:
+            sql += f" LIMIT {int(self.limit)} OFFSET {int(self.offset)}"
+
+        count = None
+        if self.count:
+            count = connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+        return APIResponse([dict(row) for row in connection.execute(sql)], count)
+
+    def _write(self):
+        if not self.rows:
+            return APIResponse([])
+
+        columns = list(self.rows[0])
+        sql = (
+            f"INSERT INTO {self.table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+
+        if self.operation == "upsert":
+            keys = (
+                [c.strip() for c in self.on_conflict.split(",")]
+                if self.on_conflict else self.client.primary_key(self.table)
+            )
+            updates = [c for c in columns if c not in keys]
+            sql += f" ON CONFLICT ({', '.join(keys)}) DO " + (
+                "UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in updates)
+                if updates else "NOTHING"
+            )
+
+        connection = self.client.connection()
+        with connection:
+            connection.executemany(sql, [[row.get(c) for c in columns] for row in self.rows])
+        return APIResponse(self.rows)
+
+
+class LocalClient:
+    """
+    Drop-in replacement for the Supabase client backed by an embedded
+    SQLite file. Tables are created from sql/Tables.sql on first use.
+    Each thread gets its own connection so the bulk loader's workers
+    can write concurrently (WAL mode, writes are serialised by SQLite).
+    """
+
+    def __init__(self, path=LOCAL_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._primary_keys = {}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        connection = self.connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            for statement in load_schema():
+                connection.execute(statement)
+
+    def connection(self):
+        if not hasattr(self._local, "connection"):
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            self._local.connection = connection
+        return self._local.connection
+
+    def primary_key(self, table):
+        if table not in self._primary_keys:
+            info = self.connection().execute(f"PRAGMA table_info({table})")
+            self._primary_keys[table] = [row["name"] for row in info if row["pk"]]
+        return self._primary_keys[table]
+
+    def table(self, name):
+        return LocalQuery(self, name)
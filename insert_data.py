@@ -1,112 +1,276 @@
-from databases.supabase_client import supabase
 import os
-from data_extraction.competitions import fetch_competitions
-from data_extraction.complexes import fetch_complexes
-from data_extraction.rankings import fetch_rankings
+from databases.backend import get_client, STORAGE_BACKEND
+from databases.bulk_loader import bulk_load, format_summary
+from databases import fingerprints, rankings_history
+from data_extraction import response_cache
+from data_extraction.competitions import fetch_competitions, URL as COMPETITIONS_URL
+from data_extraction.complexes import fetch_complexes, URL as COMPLEXES_URL
+from data_extraction.rankings import fetch_rankings, stream_rankings, URL as RANKINGS_URL
+from data_extraction.http_client import get_stats
+from pipeline.dag import run_dag, format_timings
+from dashboard import snapshot
+from dashboard.loader import load_tables
+from dashboard.aggregates import build_aggregates, BUILDERS
 
-# --------------------
-# Fetch data
-# --------------------
-print("📡 Fetching competitions...")
-categories, competitions = fetch_competitions()
+# Set SPORTSRADAR_STREAM_RANKINGS=1 to parse and load rankings in
+# bounded chunks instead of holding the whole payload in memory
+STREAM_RANKINGS = os.getenv("SPORTSRADAR_STREAM_RANKINGS") == "1"
 
-print("📡 Fetching complexes...")
-complexes, venues = fetch_complexes()
+# Supabase by default; STORAGE_BACKEND=sqlite loads a local file instead
+client = get_client()
 
-print("📡 Fetching rankings...")
-competitors, rankings = fetch_rankings()
+summaries = []
+
+# Weekly snapshots are also kept in a local columnar history store
+if rankings_history.pa is not None:
+    history = rankings_history.SnapshotWriter()
+else:
+    history = None
+    print("⚠️ pyarrow not installed, local rankings history disabled")
+
+
+def load(table, rows, key=None, mode="upsert"):
+    # Keyed upserts only send rows whose content hash changed
+    change_set = fingerprints.changes(table, key) if key else None
+    if change_set:
+        rows = change_set.filter(rows)
+
+    summary = bulk_load(client, table, rows, key=key, mode=mode)
+    summaries.append(summary)
+    print(format_summary(summary))
+
+    if change_set:
+        change_set.commit()
+        summary.update(change_set.counts)
+        print(fingerprints.format_counts(table, change_set.counts))
+
+
+def load_competitors(competitors):
+    load(
+        "competitors",
+        (
+            {
+                "competitor_id": c["competitor_id"],
+                "name": c["name"],
+                "country": c.get("country"),
+                "country_code": c.get("country_code"),
+                "abbreviation": c.get("abbreviation")
+            }
+            for c in competitors
+        ),
+        key="competitor_id",
+    )
+
+
+def load_rankings(rankings):
+    # One row per (ranking, week, competitor): re-runs of the same week
+    # update the snapshot instead of appending duplicates
+    load(
+        "competitor_rankings",
+        (
+            {
+                "ranking_id": r.get("ranking_id"),
+                "ranking_name": r.get("ranking_name"),
+                "snapshot_date": r.get("snapshot_date"),
+                "rank": r.get("rank"),
+                "movement": r.get("movement"),
+                "points": r.get("points"),
+                "competitions_played": r.get("competitions_played"),
+                "competitor_id": r.get("competitor_id")
+            }
+            for r in rankings
+        ),
+        key=("ranking_id", "snapshot_date", "competitor_id"),
+    )
+
+    if history:
+        history.write(rankings)
+
+
+def tables_of(upstream, fetch_task):
+    """
+    Rows returned by a fetch step, or None if its payload is unchanged.
+    """
+    tables = upstream[fetch_task]
+    if tables is None:
+        print(f"⏭ {fetch_task}: payload unchanged since last run")
+    return tables
 
-# --------------------
-# Insert Categories
-# --------------------
-supabase.table("categories").upsert(
-    [
-        {
-            "category_id": c["category_id"],
-            "category_name": c["category_name"]
-        }
-        for c in categories
-    ]
-).execute()
 
 # --------------------
-# Insert Competitions
+# Competitions branch
 # --------------------
-supabase.table("competitions").upsert(
-    [
-        {
-            "competition_id": c["competition_id"],
-            "competition_name": c["competition_name"],
-            "parent_id": c["parent_id"],
-            "type": c["type"],
-            "gender": c["gender"],
-            "category_id": c["category_id"]
-        }
-        for c in competitions
-    ]
-).execute()
+def load_categories(upstream):
+    tables = tables_of(upstream, "fetch_competitions")
+    if tables:
+        categories, _ = tables
+        load(
+            "categories",
+            (
+                {
+                    "category_id": c["category_id"],
+                    "category_name": c["category_name"]
+                }
+                for c in categories
+            ),
+            key="category_id",
+        )
+
+
+def load_competitions(upstream):
+    tables = upstream["fetch_competitions"]
+    if tables:
+        _, competitions = tables
+        load(
+            "competitions",
+            (
+                {
+                    "competition_id": c["competition_id"],
+                    "competition_name": c["competition_name"],
+                    "parent_id": c["parent_id"],
+                    "type": c["type"],
+                    "gender": c["gender"],
+                    "category_id": c["category_id"]
+                }
+                for c in competitions
+            ),
+            key="competition_id",
+        )
+
 
 # --------------------
-# Insert Complexes
+# Complexes branch
 # --------------------
-supabase.table("complexes").upsert(
-    [
-        {
-            "complex_id": c["complex_id"],
-            "complex_name": c["complex_name"]
-        }
-        for c in complexes
-    ]
-).execute()
+def load_complexes(upstream):
+    tables = tables_of(upstream, "fetch_complexes")
+    if tables:
+        complexes, _ = tables
+        load(
+            "complexes",
+            (
+                {
+                    "complex_id": c["complex_id"],
+                    "complex_name": c["complex_name"]
+                }
+                for c in complexes
+            ),
+            key="complex_id",
+        )
+
+
+def load_venues(upstream):
+    tables = upstream["fetch_complexes"]
+    if tables:
+        _, venues = tables
+        load(
+            "venues",
+            (
+                {
+                    "venue_id": v["venue_id"],
+                    "venue_name": v["venue_name"],
+                    "city_name": v["city_name"],
+                    "country_name": v["country_name"],
+                    "country_code": v["country_code"],
+                    "timezone": v["timezone"],
+                    "complex_id": v["complex_id"]
+                }
+                for v in venues
+            ),
+            key="venue_id",
+        )
+
 
 # --------------------
-# Insert Venues
+# Rankings branch
 # --------------------
-supabase.table("venues").upsert(
-    [
-        {
-            "venue_id": v["venue_id"],
-            "venue_name": v["venue_name"],
-            "city_name": v["city_name"],
-            "country_name": v["country_name"],
-            "country_code": v["country_code"],
-            "timezone": v["timezone"],
-            "complex_id": v["complex_id"]
-        }
-        for v in venues
-    ]
-).execute()
+def load_competitors_step(upstream):
+    tables = tables_of(upstream, "fetch_rankings")
+    if tables:
+        load_competitors(tables[0])
+
+
+def load_rankings_step(upstream):
+    tables = upstream["fetch_rankings"]
+    if tables:
+        load_rankings(tables[1])
+
+
+def stream_rankings_step(upstream):
+    for chunk_competitors, chunk_rankings in stream_rankings():
+        # Competitors first so the rankings foreign key is satisfied
+        load_competitors(chunk_competitors)
+        load_rankings(chunk_rankings)
+
+
+def cache_response(url):
+    # Runs after every load fed by `url`: only then does the payload
+    # become the cached copy, so a failed load is retried next run
+    return lambda _: response_cache.commit(url)
+
 
 # --------------------
-# Insert Competitors
+# Pipeline DAG
 # --------------------
-supabase.table("competitors").upsert(
-    [
-        {
-            "competitor_id": c["competitor_id"],
-            "name": c["name"],
-            "country": c.get("country"),
-            "country_code": c.get("country_code"),
-            "abbreviation": c.get("abbreviation")
-        }
-        for c in competitors
-    ]
-).execute()
+# Only the foreign keys in sql/Tables.sql constrain order; everything
+# else (the three branches, and fetches) runs concurrently.
+TASKS = {
+    "fetch_competitions": (lambda _: fetch_competitions(), []),
+    "load_categories": (load_categories, ["fetch_competitions"]),
+    "load_competitions": (load_competitions, ["fetch_competitions", "load_categories"]),
+    "cache_competitions": (cache_response(COMPETITIONS_URL), ["load_categories", "load_competitions"]),
+
+    "fetch_complexes": (lambda _: fetch_complexes(), []),
+    "load_complexes": (load_complexes, ["fetch_complexes"]),
+    "load_venues": (load_venues, ["fetch_complexes", "load_complexes"]),
+    "cache_complexes": (cache_response(COMPLEXES_URL), ["load_complexes", "load_venues"]),
+}
+
+if STREAM_RANKINGS:
+    TASKS["stream_rankings"] = (stream_rankings_step, [])
+else:
+    TASKS.update({
+        "fetch_rankings": (lambda _: fetch_rankings(), []),
+        "load_competitors": (load_competitors_step, ["fetch_rankings"]),
+        "load_rankings": (load_rankings_step, ["fetch_rankings", "load_competitors"]),
+        "cache_rankings": (cache_response(RANKINGS_URL), ["load_competitors", "load_rankings"]),
+    })
+
+print(f"🚀 Running ingest pipeline ({len(TASKS)} steps)...")
+_, timings = run_dag(TASKS)
+
+print("⏱ Step timeline:")
+print(format_timings(timings))
+
+total_rows = sum(s["rows"] for s in summaries)
+total_seconds = max(end for _, end in timings.values())
+print(f"📊 Loaded {total_rows} rows in {total_seconds:.2f}s")
+print("📊 HTTP stats:", get_stats())
 
 # --------------------
-# Insert Rankings
+# Dashboard snapshot
 # --------------------
-supabase.table("competitor_rankings").insert(
-    [
-        {
-            "rank": r.get("rank"),
-            "movement": r.get("movement"),
-            "points": r.get("points"),
-            "competitions_played": r.get("competitions_played"),
-            "competitor_id": r.get("competitor_id")
-        }
-        for r in rankings
-    ]
-).execute()
-
-print("✅ DATA INSERTION COMPLETE (Supabase)")
+# Read back what the dashboard needs, add the chart summary tables and
+# publish it as a new on-disk version; running dashboards switch to it
+# on their next rerun. When no table changed, the current version is
+# still accurate and the read-back is skipped.
+changed_tables = {s["table"] for s in summaries if s["rows"]}
+previous_version = snapshot.current_version() if snapshot.available() else None
+
+if previous_version and not changed_tables:
+    print(f"⏭ Dashboard snapshot {previous_version} unchanged, not republished")
+elif snapshot.available():
+    frames, _ = load_tables(client)
+
+    # Summaries whose source tables were untouched by this load are
+    # carried over from the previous snapshot instead of recomputed
+    previous = None
+    if previous_version:
+        previous, _ = snapshot.read_snapshot(previous_version, tables=set(BUILDERS))
+    frames.update(build_aggregates(frames, previous, changed_tables))
+
+    version = snapshot.write_snapshot(frames)
+    print(f"📦 Dashboard snapshot {version} published")
+else:
+    print("⚠️ pyarrow not installed, dashboard snapshot skipped")
+
+print(f"✅ DATA INSERTION COMPLETE ({STORAGE_BACKEND})")
@@ -0,0 +1,90 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Number of pipeline steps allowed to run at the same time
+DAG_WORKERS = int(os.getenv("PIPELINE_WORKERS", "6"))
+
+
+def _check(tasks):
+    for name, (_, deps) in tasks.items():
+        for dep in deps:
+            if dep not in tasks:
+                raise ValueError(f"Task '{name}' depends on unknown task '{dep}'")
+
+    # Kahn's algorithm: every task must become reachable
+    remaining = {name: set(deps) for name, (_, deps) in tasks.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {', '.join(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_dag(tasks, workers=DAG_WORKERS):
+    """
+    Run a dependency graph of tasks on a thread pool.
+    `tasks` maps name -> (fn, [dependency names]); each fn is called with
+    a dict of its dependencies' return values as soon as they have all
+    finished, so independent branches run concurrently.
+    If a task fails, its dependents are skipped and the first error is
+    re-raised once everything still runnable has finished.
+    Returns:
+        results: dict of task name -> return value
+        timings: dict of task name -> (start, end) seconds since launch
+    """
+    _check(tasks)
+
+    results = {}
+    timings = {}
+    failed = {}
+    launched = time.perf_counter()
+    waiting = dict(tasks)
+
+    def run(name, fn, upstream):
+        start = time.perf_counter() - launched
+        value = fn(upstream)
+        timings[name] = (start, time.perf_counter() - launched)
+        return value
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+
+        while waiting or running:
+            for name, (fn, deps) in list(waiting.items()):
+                if any(dep in failed for dep in deps):
+                    failed[name] = None
+                    del waiting[name]
+                    print(f"⏭ {name} skipped (upstream failed)")
+                elif all(dep in results for dep in deps):
+                    upstream = {dep: results[dep] for dep in deps}
+                    running[pool.submit(run, name, fn, upstream)] = name
+                    del waiting[name]
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    failed[name] = e
+                    print(f"❌ {name} failed: {e}")
+
+    errors = [e for e in failed.values() if e is not None]
+    if errors:
+        raise errors[0]
+
+    return results, timings
+
+
+def format_timings(timings):
+    lines = []
+    for name, (start, end) in sorted(timings.items(), key=lambda item: item[1]):
+        lines.append(f"   {name:<22} {start:6.2f}s → {end:6.2f}s ({end - start:.2f}s)")
+    return "\n".join(lines)
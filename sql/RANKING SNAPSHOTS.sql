@@ -0,0 +1,22 @@
+-- RANKING SNAPSHOTS (Supabase / PostgreSQL migration)
+
+-- 1. Add snapshot columns to the existing rankings table
+ALTER TABLE competitor_rankings
+    ADD COLUMN IF NOT EXISTS ranking_id VARCHAR(50),
+    ADD COLUMN IF NOT EXISTS ranking_name VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS snapshot_date DATE;
+
+-- 2. Rows inserted before snapshots existed have no ranking or week and
+--    were appended again on every run, so they would collide on the key
+--    below. Drop them; the next ingest reloads the current week.
+DELETE FROM competitor_rankings
+WHERE ranking_id IS NULL OR snapshot_date IS NULL;
+
+-- 3. One row per ranking, week and competitor (target of the upsert)
+ALTER TABLE competitor_rankings
+    ADD CONSTRAINT uq_ranking_snapshot
+    UNIQUE (ranking_id, snapshot_date, competitor_id);
+
+-- 4. Fast per-competitor movement / trend lookups
+CREATE INDEX IF NOT EXISTS idx_rankings_competitor
+    ON competitor_rankings (competitor_id, snapshot_date);
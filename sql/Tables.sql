@@ -54,11 +54,16 @@ SELECT * FROM Competitors;
 
 CREATE TABLE Competitor_Rankings (
     rank_id INT AUTO_INCREMENT PRIMARY KEY,
+    ranking_id VARCHAR(50) NOT NULL,
+    ranking_name VARCHAR(100),
+    snapshot_date DATE NOT NULL,
     rank1 INT,
     movement INT,
     points INT,
     competitions_played INT,
     competitor_id VARCHAR(50),
+    UNIQUE KEY uq_ranking_snapshot (ranking_id, snapshot_date, competitor_id),
+    INDEX idx_rankings_competitor (competitor_id, snapshot_date),
     FOREIGN KEY (competitor_id) REFERENCES Competitors(competitor_id)
 );
 